@@ -11,6 +11,7 @@ from app.schemas.analysis import (
     AnalysisJobEnqueueRequest,
     AnalysisJobEnqueueResponse
 )
+from app.services.active_resume import get_active_resume_id_cached
 from app.services.advisory.exposure import get_advisory_envelope
 
 router = APIRouter()
@@ -54,7 +55,7 @@ def trigger_analysis(
 
         # Validate job posting extraction is complete
         from app.db.models.job_posting import JobPosting
-        from app.db.models.resume import Resume, ResumeData
+        from app.db.models.resume import ResumeData
 
         job_posting = db.query(JobPosting).filter(
             JobPosting.id == application.posting_id
@@ -80,8 +81,8 @@ def trigger_analysis(
             )
 
         # Validate active resume exists
-        active_resume = db.query(Resume).filter(Resume.is_active == True).first()
-        if not active_resume:
+        active_resume_id = get_active_resume_id_cached(db)
+        if not active_resume_id:
             raise HTTPException(
                 status_code=422,
                 detail="Cannot analyze: no active resume found. Upload a resume first."
@@ -89,7 +90,7 @@ def trigger_analysis(
 
         # Validate resume data exists and has skills
         resume_data = db.query(ResumeData).filter(
-            ResumeData.resume_id == active_resume.id
+            ResumeData.resume_id == active_resume_id
         ).first()
 
         if not resume_data or not resume_data.extraction_complete:
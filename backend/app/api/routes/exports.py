@@ -1,10 +1,14 @@
 import logging
 import csv
 import io
+from datetime import datetime
+from itertools import chain
+from typing import Iterable, Iterator, List
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.api.dependencies.database import get_db
+from app.db.session import SessionLocal
 from app.schemas.export import (
     ExportFilters,
     CSVExportResponse,
@@ -20,61 +24,88 @@ from app.services.export_service import (
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# CSV bytes buffered before each write to the response body
+CSV_CHUNK_BYTES = 64 * 1024
+
 
 @router.post("/csv")
-def export_to_csv(
-    filters: ExportFilters,
-    db: Session = Depends(get_db)
-):
+def export_to_csv(filters: ExportFilters):
     """
     Export applications to CSV with optional filters.
     
     Returns a streaming CSV file download.
     Handles empty results gracefully (returns headers with no data rows).
     """
+    # The response body is written after dependencies with yield have exited,
+    # so the export owns its session and closes it once streaming ends
+    db = SessionLocal()
     try:
         # Generate export data
         headers, rows = generate_export_rows(db, filters)
         
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=headers)
-        
-        # Write headers
-        writer.writeheader()
+        # Run the query up front so a failure still returns a 500
+        first_row = next(rows, None)
+        if first_row is not None:
+            rows = chain((first_row,), rows)
+    
+    except Exception as e:
+        db.close()
+        logger.error(f"CSV export failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate CSV export: {str(e)}"
+        )
+    
+    # Generate filename with timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    export_filename = f"applications_export_{timestamp}.csv"
+    
+    return StreamingResponse(
+        _stream_csv(db, headers, rows, export_filename),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename}"'
+        }
+    )
+
+
+def _stream_csv(
+    db: Session,
+    headers: List[str],
+    rows: Iterable[List],
+    export_filename: str
+) -> Iterator[bytes]:
+    """Encode rows as CSV, yielding about CSV_CHUNK_BYTES at a time."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    row_count = 0
+    
+    try:
+        writer.writerow(headers)
         
-        # Write data rows
         for row in rows:
             writer.writerow(row)
+            row_count += 1
+            
+            if output.tell() >= CSV_CHUNK_BYTES:
+                yield output.getvalue().encode('utf-8')
+                output.seek(0)
+                output.truncate(0)
         
-        # Get CSV content
-        csv_content = output.getvalue()
-        output.close()
-        
-        # Generate filename with timestamp
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        export_filename = f"applications_export_{timestamp}.csv"
+        yield output.getvalue().encode('utf-8')
         
         logger.info(
-            f"CSV export generated: {export_filename}, rows: {len(rows)}"
-        )
-        
-        # Return streaming response
-        return StreamingResponse(
-            io.BytesIO(csv_content.encode('utf-8')),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f'attachment; filename="{export_filename}"'
-            }
+            f"CSV export generated: {export_filename}, rows: {row_count}"
         )
     
     except Exception as e:
-        logger.error(f"CSV export failed: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate CSV export: {str(e)}"
-        )
+        # Headers are already sent; the client sees a truncated file
+        logger.error(f"CSV export failed while streaming: {str(e)}", exc_info=True)
+        raise
+    
+    finally:
+        output.close()
+        db.close()
 
 
 @router.post("/sheets", response_model=SheetsSyncResponse)
@@ -9,7 +9,8 @@ from app.api.dependencies.database import get_db
 from app.db.models.resume import Resume
 from app.schemas.resume import ResumeUploadResponse, ResumeResponse, ResumeDataResponse, ResumeWithDataResponse
 from app.core.config import settings
-from app.services.resume_parser import parse_resume_sync
+from app.services.active_resume import invalidate_active_resume_cache
+from app.services.resume_parser import parse_resume_async, parse_resume_sync
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -87,6 +88,7 @@ async def upload_resume(
 
         db.add(resume)
         db.commit()
+        invalidate_active_resume_cache()
         db.refresh(resume)
 
         logger.info(
@@ -99,9 +101,9 @@ async def upload_resume(
             }
         )
 
-        # Parse resume synchronously
+        # Parse resume before responding, off the event loop
         try:
-            resume_data = parse_resume_sync(resume.id, db)
+            resume_data = await parse_resume_async(resume.id, db)
 
             # Generate warnings for missing or incomplete data
             warnings = []
@@ -0,0 +1,33 @@
+"""add analysis signature index
+
+Revision ID: add_analysis_signature
+Revises: add_traceability_fields
+Create Date: 2026-10-16
+
+Description:
+Supports the reuse lookup in AnalysisService, which looks for an existing
+analysis of the same application with a matching input signature stored in
+analysis_metadata.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_analysis_signature'
+down_revision = 'add_traceability_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'idx_analysis_results_app_signature',
+        'analysis_results',
+        ['application_id', sa.text("(analysis_metadata->>'signature')")],
+        postgresql_where=sa.text("analysis_metadata ? 'signature'"),
+    )
+
+
+def downgrade():
+    op.drop_index('idx_analysis_results_app_signature', table_name='analysis_results')
@@ -0,0 +1,54 @@
+"""add normalized company/title columns to applications
+
+Revision ID: add_application_norm_columns
+Revises: add_timeline_app_occurred
+Create Date: 2026-10-16
+
+Description:
+Adds company_name_norm and job_title_norm as stored generated columns
+(lower(btrim(...))) plus a partial btree index on the pair. Email
+correlation looks up exact normalized matches with an index probe and
+scores fuzzy candidates on the stored values instead of normalizing every
+row in Python.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_application_norm_columns'
+down_revision = 'add_timeline_app_occurred'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'applications',
+        sa.Column(
+            'company_name_norm',
+            sa.String(length=255),
+            sa.Computed('lower(btrim(company_name))', persisted=True),
+        )
+    )
+    op.add_column(
+        'applications',
+        sa.Column(
+            'job_title_norm',
+            sa.String(length=255),
+            sa.Computed('lower(btrim(job_title))', persisted=True),
+        )
+    )
+    op.create_index(
+        'idx_applications_company_title_norm',
+        'applications',
+        ['company_name_norm', 'job_title_norm'],
+        unique=False,
+        postgresql_where=sa.text('is_deleted = false'),
+    )
+
+
+def downgrade():
+    op.drop_index('idx_applications_company_title_norm', table_name='applications')
+    op.drop_column('applications', 'job_title_norm')
+    op.drop_column('applications', 'company_name_norm')
@@ -0,0 +1,36 @@
+"""add trigram index on applications.company_name
+
+Revision ID: add_company_name_trgm
+Revises: add_analysis_signature
+Create Date: 2026-10-16
+
+Description:
+Enables pg_trgm and adds a GIN trigram index on applications.company_name.
+Email correlation uses the % operator to prefilter candidate applications
+in SQL instead of scoring every row in Python. The same index also serves
+leading-wildcard ILIKE filters on company_name.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_company_name_trgm'
+down_revision = 'add_analysis_signature'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'idx_applications_company_name_trgm',
+        'applications',
+        ['company_name'],
+        postgresql_using='gin',
+        postgresql_ops={'company_name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade():
+    op.drop_index('idx_applications_company_name_trgm', table_name='applications')
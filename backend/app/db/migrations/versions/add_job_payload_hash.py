@@ -0,0 +1,32 @@
+"""add source payload hash to job_postings
+
+Revision ID: add_job_payload_hash
+Revises: add_application_norm_columns
+Create Date: 2026-10-16
+
+Description:
+Adds job_postings.source_payload_hash, a hex digest of the raw source
+payload a job was ingested from. Ingestion upserts only update a row when
+the digest changed, so re-ingesting an unchanged board leaves rows (and
+their updated_at) untouched.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_job_payload_hash'
+down_revision = 'add_application_norm_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'job_postings',
+        sa.Column('source_payload_hash', sa.String(length=32), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column('job_postings', 'source_payload_hash')
@@ -0,0 +1,34 @@
+"""add composite index on timeline_events (application_id, occurred_at DESC)
+
+Revision ID: add_timeline_app_occurred
+Revises: add_company_name_trgm
+Create Date: 2026-10-16
+
+Description:
+Supports the latest-event-per-application lookup used by exports
+(DISTINCT ON application_id ordered by occurred_at DESC), which can then
+be answered with one index range scan per application instead of an
+aggregate plus a join back to timeline_events.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_timeline_app_occurred'
+down_revision = 'add_company_name_trgm'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'idx_timeline_events_app_occurred',
+        'timeline_events',
+        ['application_id', sa.text('occurred_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('idx_timeline_events_app_occurred', table_name='timeline_events')
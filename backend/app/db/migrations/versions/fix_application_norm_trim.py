@@ -0,0 +1,70 @@
+"""trim all edge whitespace in the normalized application columns
+
+Revision ID: fix_application_norm_trim
+Revises: add_job_payload_hash
+Create Date: 2026-10-16
+
+Description:
+Regenerates company_name_norm and job_title_norm with a regexp trim of
+NORM_TRIM_CHARS (space, tab, newline, CR, form feed, vertical tab,
+no-break space) instead of btrim, which only strips spaces. Email-parsed
+names often end in a newline or NBSP, and correlation normalizes its input
+with the same character set, so both sides now agree. Generated columns
+cannot change their expression in place before Postgres 17, so the columns
+and their index are dropped and re-added.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fix_application_norm_trim'
+down_revision = 'add_job_payload_hash'
+branch_labels = None
+depends_on = None
+
+# Inlined rather than imported from the model so this revision stays fixed
+_TRIM_RE = r"'^[ \t\n\r\f\v\u00a0]+|[ \t\n\r\f\v\u00a0]+$'"
+
+
+def _recreate_norm_columns(company_expr: str, title_expr: str):
+    op.drop_index('idx_applications_company_title_norm', table_name='applications')
+    op.drop_column('applications', 'job_title_norm')
+    op.drop_column('applications', 'company_name_norm')
+    op.add_column(
+        'applications',
+        sa.Column(
+            'company_name_norm',
+            sa.String(length=255),
+            sa.Computed(company_expr, persisted=True),
+        )
+    )
+    op.add_column(
+        'applications',
+        sa.Column(
+            'job_title_norm',
+            sa.String(length=255),
+            sa.Computed(title_expr, persisted=True),
+        )
+    )
+    op.create_index(
+        'idx_applications_company_title_norm',
+        'applications',
+        ['company_name_norm', 'job_title_norm'],
+        unique=False,
+        postgresql_where=sa.text('is_deleted = false'),
+    )
+
+
+def upgrade():
+    _recreate_norm_columns(
+        f"lower(regexp_replace(company_name, {_TRIM_RE}, '', 'g'))",
+        f"lower(regexp_replace(job_title, {_TRIM_RE}, '', 'g'))",
+    )
+
+
+def downgrade():
+    _recreate_norm_columns(
+        'lower(btrim(company_name))',
+        'lower(btrim(job_title))',
+    )
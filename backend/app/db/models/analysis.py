@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID as PyUUID, uuid4
-from sqlalchemy import String, Integer, ForeignKey, Index, CheckConstraint
+from sqlalchemy import String, Integer, ForeignKey, Index, CheckConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
@@ -51,4 +51,10 @@ class AnalysisResult(Base):
         Index("idx_analysis_results_resume_id", "resume_id"),
         Index("idx_analysis_results_job_posting_id", "job_posting_id"),
         Index("idx_analysis_results_qualifications", "qualifications_met", "qualifications_missing", postgresql_using="gin"),
+        Index(
+            "idx_analysis_results_app_signature",
+            "application_id",
+            text("(analysis_metadata->>'signature')"),
+            postgresql_where=text("analysis_metadata ? 'signature'"),
+        ),
     )
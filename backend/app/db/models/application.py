@@ -1,18 +1,38 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID as PyUUID, uuid4
-from sqlalchemy import Boolean, CheckConstraint, Date, DateTime, Index, String, Text, ForeignKey
+from sqlalchemy import Boolean, CheckConstraint, Computed, Date, DateTime, Index, String, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func, text, desc
 from app.db.base import Base
 
+# Whitespace trimmed from both ends before correlation matching. The generated
+# *_norm columns and correlator._normalize must strip exactly this set.
+NORM_TRIM_CHARS = " \t\n\r\f\v\u00a0"
+_NORM_TRIM_RE = r"'^[ \t\n\r\f\v\u00a0]+|[ \t\n\r\f\v\u00a0]+$'"
+
+
+def norm_expression(column: str) -> str:
+    """SQL for the lowercased, NORM_TRIM_CHARS-trimmed form of column."""
+    return f"lower(regexp_replace({column}, {_NORM_TRIM_RE}, '', 'g'))"
+
+
 class Application(Base):
     __tablename__ = "applications"
     
     id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     company_name: Mapped[str] = mapped_column(String(255), nullable=False)
     job_title: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Lowercased/trimmed copies maintained by Postgres, used for correlation matching
+    company_name_norm: Mapped[str] = mapped_column(
+        String(255),
+        Computed(norm_expression("company_name"), persisted=True)
+    )
+    job_title_norm: Mapped[str] = mapped_column(
+        String(255),
+        Computed(norm_expression("job_title"), persisted=True)
+    )
     job_posting_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     application_date: Mapped[datetime] = mapped_column(Date, nullable=False)
     source: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -65,6 +85,18 @@ class Application(Base):
         Index("idx_applications_analysis_id", "analysis_id"),
         Index("idx_applications_resume_id", "resume_id"),
         Index("idx_applications_company_name", "company_name", postgresql_where=text("is_deleted = false")),
+        Index(
+            "idx_applications_company_title_norm",
+            "company_name_norm",
+            "job_title_norm",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index(
+            "idx_applications_company_name_trgm",
+            "company_name",
+            postgresql_using="gin",
+            postgresql_ops={"company_name": "gin_trgm_ops"},
+        ),
         Index(
             "idx_applications_created_at",
             desc("created_at"),
@@ -31,6 +31,7 @@ class JobPosting(Base):
     source_timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)  # When this job was fetched
     posted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)  # Original posting date from source
     industry: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)  # Classified industry category
+    source_payload_hash: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)  # Digest of the raw payload, to skip no-op re-ingestion
 
     # Status flags
     extraction_complete: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
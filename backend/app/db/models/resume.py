@@ -3,7 +3,7 @@ from typing import Optional
 from uuid import uuid4
 from sqlalchemy import String, Text, Integer, Boolean, ForeignKey, Index, CheckConstraint, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from app.db.base import Base, TimestampMixin
 
 
@@ -73,6 +73,11 @@ class ResumeData(Base, TimestampMixin):
     extraction_complete: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     resume = relationship("Resume", back_populates="resume_data")
+
+    @validates("skills", "experience", "education", "certifications")
+    def _validate_list_field(self, key, value):
+        # Normalized on write so readers can rely on getting a list
+        return value if isinstance(value, list) else []
     
     __table_args__ = (
         UniqueConstraint("resume_id", name="uq_resume_id"),
@@ -36,6 +36,7 @@ class TimelineEvent(Base):
     
     __table_args__ = (
         Index("idx_timeline_events_application_id", "application_id"),
+        Index("idx_timeline_events_app_occurred", "application_id", desc("occurred_at")),
         Index("idx_timeline_events_occurred_at", desc("occurred_at")),
         Index("idx_timeline_events_type", "event_type"),
     )
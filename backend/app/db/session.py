@@ -1,14 +1,25 @@
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, Generator
 from app.core.config import settings
 
+
+def _json_dumps(value: Any) -> str:
+    """JSON/JSONB bind serializer; orjson is a C encoder, unlike json.dumps."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create engine and session factory at module level
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_size=10,
-    max_overflow=20
+    max_overflow=20,
+    # JSONB columns (resume data, intent profiles, analysis lists) are
+    # encoded and decoded with orjson on every read and write
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,54 @@
+"""
+Active resume lookup cache.
+
+The active resume only changes on upload, but its id is read on every
+analysis request. The id is cached per process for a short TTL and dropped
+explicitly whenever the active flag is rewritten. Invalidation only reaches
+the process that handled the upload, so use this on API request paths only;
+workers read is_active directly.
+"""
+import threading
+import time
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.db.models.resume import Resume
+
+ACTIVE_RESUME_TTL_SECONDS = 30.0
+
+_lock = threading.Lock()
+_cached_id: Optional[UUID] = None
+_expires_at = 0.0
+
+
+def get_active_resume_id_cached(db: Session) -> Optional[UUID]:
+    """Return the active resume id, hitting the database at most once per TTL."""
+    global _cached_id, _expires_at
+
+    with _lock:
+        if time.monotonic() < _expires_at:
+            return _cached_id
+
+    resume_id = (
+        db.query(Resume.id)
+        .filter(Resume.is_active == True)
+        .limit(1)
+        .scalar()
+    )
+
+    with _lock:
+        _cached_id = resume_id
+        _expires_at = time.monotonic() + ACTIVE_RESUME_TTL_SECONDS
+
+    return resume_id
+
+
+def invalidate_active_resume_cache() -> None:
+    """Drop the cached id; call after changing which resume is active."""
+    global _cached_id, _expires_at
+
+    with _lock:
+        _cached_id = None
+        _expires_at = 0.0
@@ -1,6 +1,8 @@
+import hashlib
 import logging
 from uuid import UUID
 from typing import Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.db.models.application import Application
@@ -43,7 +45,7 @@ class AnalysisService:
         Steps:
         1. Load application
         2. Validate job posting exists
-        3. Load active resume
+        3. Load active resume (reuse prior analysis if inputs are unchanged)
         4. Call LLM
         5. Persist results
         6. Update application
@@ -77,21 +79,51 @@ class AnalysisService:
         if not job_posting.description:
             raise MissingDataError("Job posting has no description")
         
-        # Step 3: Load active resume
-        active_resume = db.query(Resume).filter(
+        # Step 3: Load active resume. Read is_active directly rather than
+        # through the per-process cache: uploads run in the API process, so
+        # this worker would not see the invalidation.
+        active_resume_id = db.query(Resume.id).filter(
             Resume.is_active == True
-        ).first()
+        ).limit(1).scalar()
         
-        if not active_resume:
+        if not active_resume_id:
             raise MissingDataError("No active resume found")
         
         resume_data = db.query(ResumeData).filter(
-            ResumeData.resume_id == active_resume.id
+            ResumeData.resume_id == active_resume_id
         ).first()
         
         if not resume_data:
             raise MissingDataError("Resume data not found")
 
+        # Reuse the latest analysis if neither input has changed since
+        signature = self._analysis_signature(
+            resume_id=active_resume_id,
+            resume_data=resume_data,
+            job_posting=job_posting
+        )
+
+        existing = db.query(AnalysisResult).filter(
+            AnalysisResult.application_id == application_id,
+            AnalysisResult.analysis_metadata.has_key("signature"),
+            AnalysisResult.analysis_metadata["signature"].astext == signature
+        ).order_by(AnalysisResult.created_at.desc()).first()
+
+        if existing:
+            if application.analysis_id != existing.id or not application.analysis_completed:
+                application.analysis_id = existing.id
+                application.analysis_completed = True
+                db.commit()
+
+            logger.info(
+                f"Reusing unchanged analysis for application {application_id}",
+                extra={
+                    "application_id": str(application_id),
+                    "analysis_id": str(existing.id)
+                }
+            )
+            return existing
+
         # Get intent profile for context-aware analysis
         intent_profile_data = None
         if hasattr(resume_data, 'intent_profile') and resume_data.intent_profile:
@@ -103,7 +135,7 @@ class AnalysisService:
             extra={
                 "application_id": str(application_id),
                 "job_posting_id": str(job_posting.id),
-                "resume_id": str(active_resume.id),
+                "resume_id": str(active_resume_id),
                 "has_intent_profile": intent_profile_data is not None
             }
         )
@@ -113,56 +145,81 @@ class AnalysisService:
                 job_description=job_posting.description,
                 job_requirements=job_posting.requirements,
                 resume_summary=resume_data.summary,
-                resume_skills=resume_data.skills if isinstance(resume_data.skills, list) else [],
-                resume_experience=resume_data.experience if isinstance(resume_data.experience, list) else [],
-                resume_education=resume_data.education if isinstance(resume_data.education, list) else [],
-                intent_profile=intent_profile_data
+                resume_skills=resume_data.skills or [],
+                resume_experience=resume_data.experience or [],
+                resume_education=resume_data.education or [],
+                intent_profile=intent_profile_data,
+                resume_id=active_resume_id,
+                resume_version=resume_data.updated_at
             )
         except Exception as e:
             logger.error(f"LLM call failed for application {application_id}", exc_info=True)
             raise LLMError(f"LLM analysis failed: {str(e)}")
         
-        # Step 5: Persist results
-        analysis = AnalysisResult(
-            application_id=application_id,
-            resume_id=active_resume.id,
-            job_posting_id=job_posting.id,
-            match_score=result["match_score"],
-            qualifications_met=result["matched_qualifications"],
-            qualifications_missing=result["missing_qualifications"],
-            suggestions=result["skill_suggestions"],
-            llm_provider=self.llm_client.provider,
-            llm_model=result["model_used"],
-            analysis_metadata={
-                "tokens_used": result.get("tokens_used")
-            }
-        )
-        
-        db.add(analysis)
-        db.flush()
+        # Step 5: Persist results. RETURNING gives the new id without a separate
+        # refresh; commit below still expires the row, and it reloads lazily
+        # only if a caller reads it
+        analysis = db.scalars(
+            insert(AnalysisResult)
+            .values(
+                application_id=application_id,
+                resume_id=active_resume_id,
+                job_posting_id=job_posting.id,
+                match_score=result["match_score"],
+                qualifications_met=result["matched_qualifications"],
+                qualifications_missing=result["missing_qualifications"],
+                suggestions=result["skill_suggestions"],
+                llm_provider=self.llm_client.provider,
+                llm_model=result["model_used"],
+                analysis_metadata={
+                    "tokens_used": result.get("tokens_used"),
+                    "signature": signature
+                }
+            )
+            .returning(AnalysisResult)
+        ).one()
+        analysis_id = analysis.id
         
         # Step 6: Update application
-        application.analysis_id = analysis.id
+        application.analysis_id = analysis_id
         application.analysis_completed = True
         
         # Step 7: Emit timeline event
+        # The application UPDATE and timeline INSERT go out in the same flush
+        # and commit as the analysis row; a single connection cannot pipeline
+        # them further, so there is nothing to gain from issuing them concurrently.
         log_analysis_completed_sync(
             db=db,
             application_id=application_id,
-            analysis_id=analysis.id,
+            analysis_id=analysis_id,
             match_score=result["match_score"]
         )
         
         db.commit()
-        db.refresh(analysis)
         
         logger.info(
             f"Analysis completed for application {application_id}",
             extra={
                 "application_id": str(application_id),
-                "analysis_id": str(analysis.id),
+                "analysis_id": str(analysis_id),
                 "match_score": result["match_score"]
             }
         )
         
         return analysis
+
+    def _analysis_signature(
+        self,
+        resume_id: UUID,
+        resume_data: ResumeData,
+        job_posting: JobPosting
+    ) -> str:
+        """Fingerprint of the inputs an analysis was computed from."""
+        parts = (
+            str(resume_id),
+            resume_data.updated_at.isoformat() if resume_data.updated_at else "",
+            str(job_posting.id),
+            job_posting.updated_at.isoformat() if job_posting.updated_at else "",
+            self.llm_client.model,
+        )
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
@@ -1,25 +1,93 @@
-import json
 import logging
 import os
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+import orjson
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Per-section token budgets for the analysis prompt
+JOB_DESCRIPTION_TOKENS = 500
+JOB_REQUIREMENTS_TOKENS = 250
+SKILLS_TOKENS = 250
+EXPERIENCE_TOKENS = 500
+EDUCATION_TOKENS = 250
+
+# Rough ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Max number of prebuilt resume sections kept in memory
+RESUME_SECTION_CACHE_SIZE = 64
+
+ANALYSIS_PROMPT_TEMPLATE = """You are a job application analyzer. Compare the candidate's resume against a job posting and provide a structured analysis.
+
+JOB POSTING:
+---
+{job_section}
+---
+
+CANDIDATE RESUME:
+---
+{resume_section}
+---
+
+{intent_section}Analyze the match between this resume and job posting. Return ONLY valid JSON with this exact structure:
+
+{{
+  "match_score": <integer 0-100>,
+  "matched_qualifications": [<list of qualification strings the candidate meets>],
+  "missing_qualifications": [<list of qualification strings the candidate lacks>],
+  "skill_suggestions": [<list of specific skills the candidate should highlight or develop>]
+}}
+
+Guidelines:
+- match_score: 0-100 where 100 is perfect match
+- Consider both skill overlap AND career intent alignment
+- matched_qualifications: specific requirements from job posting that candidate meets
+- missing_qualifications: specific requirements from job posting that candidate lacks
+- skill_suggestions: actionable skills to learn or emphasize, considering their career intent
+
+Return ONLY the JSON object, no other text.
+"""
+
+
+# Low-cost model tried first for intent analysis, per provider
+CHEAP_MODELS = {
+    "openai": "gpt-4o-mini",
+    "anthropic": "claude-3-5-haiku-latest",
+}
+
+
+# Output cap for intent analysis; the response is one small JSON object
+INTENT_MAX_TOKENS = 350
+
+# OpenAI model families that accept response_format={"type": "json_object"}
+JSON_MODE_MODEL_PREFIXES = ("gpt-4o", "gpt-4-turbo", "gpt-4.1", "gpt-3.5-turbo")
+
 
 class LLMSettings(BaseModel):
     provider: str = "openai"
     model: str = "gpt-4"
+    # Tried before `model` for intent analysis; defaults to CHEAP_MODELS[provider]
+    cheap_model: Optional[str] = None
     temperature: float = 0.2
     max_tokens: int = 1500
     api_key: Optional[str] = None
 
 
 class LLMClient:
+    # (resume_id, model) -> (resume version, prebuilt resume prompt section)
+    _resume_section_cache: Dict[Tuple[UUID, str], Tuple[Optional[datetime], str]] = {}
+
     def __init__(self, settings: LLMSettings):
         self.settings = settings
         self.provider = settings.provider.lower()
         self.model = settings.model
+        self.cheap_model = settings.cheap_model or CHEAP_MODELS.get(self.provider)
+        self._encoding = None
+        self._encoding_loaded = False
         
         if self.provider == "openai":
             try:
@@ -38,12 +106,78 @@ class LLMClient:
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
-    def analyze(self, prompt: str) -> str:
+    def _get_encoding(self):
+        """Tokenizer for the configured model, or None when tiktoken is unusable."""
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            try:
+                import tiktoken
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    # Non-OpenAI models: cl100k is a close enough approximation
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                logger.warning("tiktoken unavailable, truncating prompt sections by characters")
+                self._encoding = None
+        return self._encoding
+
+    def _trim(self, text: str, max_tokens: int) -> str:
+        """Truncate text to a token budget."""
+        encoding = self._get_encoding()
+        if encoding is None:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+
+    def _intent_request(self, prompt: str, prefix: str, model: Optional[str] = None) -> dict:
+        """
+        Keyword arguments for an intent analysis call on the configured provider.
+
+        The prefix goes in its own leading segment so providers can serve it
+        from their prompt cache; only the prompt differs between calls.
+        """
+        model = model or self.model
+        if self.provider == "openai":
+            messages = [{"role": "system", "content": "You are a precise analyzer. Return only valid JSON."}]
+            if prefix:
+                messages.append({"role": "user", "content": prefix})
+            messages.append({"role": "user", "content": prompt})
+            request = {
+                "model": model,
+                "messages": messages,
+                "temperature": self.settings.temperature,
+                "max_tokens": min(self.settings.max_tokens, INTENT_MAX_TOKENS),
+            }
+            if model.startswith(JSON_MODE_MODEL_PREFIXES):
+                request["response_format"] = {"type": "json_object"}
+            return request
+
+        request = {
+            "model": model,
+            "max_tokens": min(self.settings.max_tokens, INTENT_MAX_TOKENS),
+            "temperature": self.settings.temperature,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+        }
+        if prefix:
+            request["system"] = [
+                {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}
+            ]
+        return request
+
+    def analyze(self, prompt: str, prefix: str = "", model: Optional[str] = None) -> str:
         """
         Synchronous analysis method for intent profiling.
 
         Args:
             prompt: The prompt to send to the LLM
+            prefix: Static instructions sent ahead of the prompt
+            model: Model to use instead of the configured one
 
         Returns:
             str: The LLM's response text
@@ -56,29 +190,35 @@ class LLMClient:
                 # Synchronous OpenAI call
                 import openai
                 sync_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-                response = sync_client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a precise analyzer. Return only valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=self.settings.temperature,
-                    max_tokens=self.settings.max_tokens,
-                )
+                response = sync_client.chat.completions.create(**self._intent_request(prompt, prefix, model))
                 return response.choices[0].message.content
 
             elif self.provider == "anthropic":
                 # Synchronous Anthropic call
                 import anthropic
                 sync_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-                response = sync_client.messages.create(
-                    model=self.model,
-                    max_tokens=self.settings.max_tokens,
-                    temperature=self.settings.temperature,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
+                response = sync_client.messages.create(**self._intent_request(prompt, prefix, model))
+                return response.content[0].text
+
+            else:
+                raise ValueError(f"Unsupported provider: {self.provider}")
+
+        except Exception as e:
+            logger.error(f"LLM call failed: {str(e)}", exc_info=True)
+            raise
+
+    async def aanalyze(self, prompt: str, prefix: str = "", model: Optional[str] = None) -> str:
+        """Async counterpart of analyze(), using the client's async SDK."""
+        if not self.client:
+            raise RuntimeError(f"{self.provider} SDK not available")
+
+        try:
+            if self.provider == "openai":
+                response = await self.client.chat.completions.create(**self._intent_request(prompt, prefix, model))
+                return response.choices[0].message.content
+
+            elif self.provider == "anthropic":
+                response = await self.client.messages.create(**self._intent_request(prompt, prefix, model))
                 return response.content[0].text
 
             else:
@@ -96,11 +236,16 @@ class LLMClient:
         resume_skills: List[str],
         resume_experience: List[dict],
         resume_education: List[dict],
-        intent_profile: Optional[dict] = None
+        intent_profile: Optional[dict] = None,
+        resume_id: Optional[UUID] = None,
+        resume_version: Optional[datetime] = None
     ) -> dict:
         """
         Calls the LLM and returns a parsed dict with analysis results.
 
+        When resume_id is given, the resume part of the prompt is reused across
+        calls until resume_version (the ResumeData.updated_at) changes.
+
         Returns:
             dict with keys: match_score, matched_qualifications, missing_qualifications,
                           skill_suggestions, model_used, tokens_used
@@ -115,7 +260,9 @@ class LLMClient:
             resume_skills=resume_skills,
             resume_experience=resume_experience,
             resume_education=resume_education,
-            intent_profile=intent_profile
+            intent_profile=intent_profile,
+            resume_id=resume_id,
+            resume_version=resume_version
         )
         
         try:
@@ -143,7 +290,9 @@ class LLMClient:
         resume_skills: List[str],
         resume_experience: List[dict],
         resume_education: List[dict],
-        intent_profile: Optional[dict] = None
+        intent_profile: Optional[dict] = None,
+        resume_id: Optional[UUID] = None,
+        resume_version: Optional[datetime] = None
     ) -> str:
         """Build the analysis prompt."""
 
@@ -167,53 +316,45 @@ but whether this role aligns with the candidate's apparent career direction.
 
 """
 
-        prompt = f"""You are a job application analyzer. Compare the candidate's resume against a job posting and provide a structured analysis.
-
-JOB POSTING:
----
-Description:
-{{job_description}}
-
-{{job_requirements_section}}
----
-
-CANDIDATE RESUME:
----
-{{resume_summary_section}}
-
-Skills:
-{{skills_list}}
-
-Experience:
-{{experience_list}}
-
-Education:
-{{education_list}}
----
-
-{intent_section}Analyze the match between this resume and job posting. Return ONLY valid JSON with this exact structure:
-
-{{{{
-  "match_score": <integer 0-100>,
-  "matched_qualifications": [<list of qualification strings the candidate meets>],
-  "missing_qualifications": [<list of qualification strings the candidate lacks>],
-  "skill_suggestions": [<list of specific skills the candidate should highlight or develop>]
-}}}}
+        if resume_id is not None:
+            resume_section = self._get_cached_resume_section(
+                resume_id=resume_id,
+                resume_version=resume_version,
+                resume_summary=resume_summary,
+                resume_skills=resume_skills,
+                resume_experience=resume_experience,
+                resume_education=resume_education
+            )
+        else:
+            resume_section = self._build_resume_section(
+                resume_summary=resume_summary,
+                resume_skills=resume_skills,
+                resume_experience=resume_experience,
+                resume_education=resume_education
+            )
 
-Guidelines:
-- match_score: 0-100 where 100 is perfect match
-- Consider both skill overlap AND career intent alignment
-- matched_qualifications: specific requirements from job posting that candidate meets
-- missing_qualifications: specific requirements from job posting that candidate lacks
-- skill_suggestions: actionable skills to learn or emphasize, considering their career intent
+        return ANALYSIS_PROMPT_TEMPLATE.format(
+            job_section=self._build_job_section(job_description, job_requirements),
+            resume_section=resume_section,
+            intent_section=intent_section
+        )
 
-Return ONLY the JSON object, no other text.
-"""
-        
+    def _build_job_section(self, job_description: str, job_requirements: Optional[str]) -> str:
+        """Build the job posting part of the prompt."""
         job_requirements_section = ""
         if job_requirements:
-            job_requirements_section = f"Requirements:\n{job_requirements}"
-        
+            job_requirements_section = self._trim(f"Requirements:\n{job_requirements}", JOB_REQUIREMENTS_TOKENS)
+
+        return f"Description:\n{self._trim(job_description, JOB_DESCRIPTION_TOKENS)}\n\n{job_requirements_section}"
+
+    def _build_resume_section(
+        self,
+        resume_summary: Optional[str],
+        resume_skills: List[str],
+        resume_experience: List[dict],
+        resume_education: List[dict]
+    ) -> str:
+        """Build the resume part of the prompt."""
         resume_summary_section = ""
         if resume_summary:
             resume_summary_section = f"Summary:\n{resume_summary}\n"
@@ -234,15 +375,41 @@ Return ONLY the JSON object, no other text.
             institution = edu.get("institution", "Unknown")
             education_list.append(f"- {degree} from {institution}")
         education_list = "\n".join(education_list) if education_list else "None listed"
-        
-        return prompt.format(
-            job_description=job_description[:2000],
-            job_requirements_section=job_requirements_section[:1000] if job_requirements else "",
-            resume_summary_section=resume_summary_section,
-            skills_list=skills_list[:1000],
-            experience_list=experience_list[:2000],
-            education_list=education_list[:1000]
+
+        return (
+            f"{resume_summary_section}\n\n"
+            f"Skills:\n{self._trim(skills_list, SKILLS_TOKENS)}\n\n"
+            f"Experience:\n{self._trim(experience_list, EXPERIENCE_TOKENS)}\n\n"
+            f"Education:\n{self._trim(education_list, EDUCATION_TOKENS)}"
         )
+
+    def _get_cached_resume_section(
+        self,
+        resume_id: UUID,
+        resume_version: Optional[datetime],
+        **resume_fields
+    ) -> str:
+        """
+        Return the resume section for a resume, building it at most once per version.
+
+        Entries are shared across client instances (the worker builds a new
+        client per job) and keyed by model since trimming depends on the tokenizer.
+        """
+        cache = LLMClient._resume_section_cache
+        key = (resume_id, self.model)
+
+        cached = cache.get(key)
+        if cached is not None and cached[0] == resume_version:
+            return cached[1]
+
+        section = self._build_resume_section(**resume_fields)
+
+        cache.pop(key, None)
+        cache[key] = (resume_version, section)
+        while len(cache) > RESUME_SECTION_CACHE_SIZE:
+            del cache[next(iter(cache))]
+
+        return section
     
     async def _call_openai(self, prompt: str) -> dict:
         """Call OpenAI API."""
@@ -302,8 +469,8 @@ Return ONLY the JSON object, no other text.
         content = content.strip()
         
         try:
-            parsed = json.loads(content)
-        except json.JSONDecodeError as e:
+            parsed = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM response as JSON: {content[:200]}")
             raise ValueError(f"Invalid JSON response from LLM: {str(e)}")
         
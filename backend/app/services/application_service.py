@@ -1,4 +1,7 @@
+import re
 from datetime import date, datetime, timezone
+from typing import Optional, Union
+from sqlalchemy import insert, inspect, select, update
 from sqlalchemy.orm import Session
 from app.db.models.application import Application
 from app.db.models.resume import Resume
@@ -7,100 +10,131 @@ from app.schemas.email import EmailIngestRequest
 from app.services.timeline_service import record_application_created_event
 from logging import Logger
 
+# Placeholder values rejected for company name / job title on capture
+_BANNED = frozenset({"unknown", "n/a", "none", "null", "undefined", "test", "string"})
+_PLACEHOLDER_URLS = frozenset({"http://example.com", "https://example.com", "http://localhost", "https://localhost"})
+_URL_RE = re.compile(r"^https?://", re.I)
 
-def create_application_from_capture(
+# Max characters of the email body copied into application notes
+EMAIL_NOTES_BODY_LIMIT = 4096
+
+# Column attributes callers may set through update_application_fields
+_APPLICATION_WRITABLE = frozenset(
+    attr.key for attr in inspect(Application).column_attrs
+    if attr.columns[0].computed is None
+) - {"id", "created_at"}
+
+# Active resume resolved inside the INSERT itself, so creation is one round trip
+_ACTIVE_RESUME_ID = (
+    select(Resume.id)
+    .where(Resume.is_active == True)
+    .limit(1)
+    .scalar_subquery()
+)
+
+
+def _build_application(
     db: Session,
-    request: CaptureApplicationRequest
+    request: Union[CaptureApplicationRequest, EmailIngestRequest],
+    source: str,
+    *,
+    application_date: date,
+    notes: Optional[str],
+    needs_review: bool
 ) -> Application:
-    """Create application record from browser extension capture."""
+    """Insert an application linked to the active resume and record its creation event."""
+    stmt = (
+        insert(Application)
+        .values(
+            company_name=request.company_name or "Unknown Company",
+            job_title=request.job_title or "Unknown Position",
+            job_posting_url=request.job_posting_url or "",
+            application_date=application_date,
+            status="applied",
+            source=source,
+            notes=notes,
+            needs_review=needs_review,
+            analysis_completed=False,
+            resume_id=_ACTIVE_RESUME_ID,
+        )
+        .returning(Application)
+    )
+    application = db.scalars(stmt).one()
 
-    # Semantic validation - check for meaningful data, not specific strings
+    # Record timeline event
+    record_application_created_event(
+        db=db,
+        application_id=application.id,
+        source=source
+    )
+
+    return application
+
+
+def _validate_capture_request(request: CaptureApplicationRequest) -> None:
+    """Semantic validation - check for meaningful data, not specific strings."""
     if not request.company_name or len(request.company_name.strip()) < 2:
         raise ValueError("Company name must be at least 2 characters")
 
     company_lower = request.company_name.strip().lower()
-    if company_lower in ["unknown", "n/a", "none", "null", "undefined", "test"]:
+    if company_lower in _BANNED:
         raise ValueError("Please provide a valid company name")
 
     if not request.job_title or len(request.job_title.strip()) < 2:
         raise ValueError("Job title must be at least 2 characters")
 
     job_title_lower = request.job_title.strip().lower()
-    if job_title_lower in ["unknown", "n/a", "none", "null", "undefined", "test"]:
+    if job_title_lower in _BANNED:
         raise ValueError("Please provide a valid job title")
 
     if not request.job_posting_url or len(request.job_posting_url.strip()) < 10:
         raise ValueError("Job posting URL must be at least 10 characters")
 
-    url_lower = request.job_posting_url.strip().lower()
-    if not (url_lower.startswith("http://") or url_lower.startswith("https://")):
+    url = request.job_posting_url.strip()
+    if not _URL_RE.match(url):
         raise ValueError("Job posting URL must start with http:// or https://")
 
-    if url_lower in ["http://example.com", "https://example.com", "http://localhost", "https://localhost"]:
+    if url.lower() in _PLACEHOLDER_URLS:
         raise ValueError("Please provide a real job posting URL")
 
     # Notes can be empty or any value (optional field)
 
-    # Get active resume
-    active_resume = db.query(Resume).filter(Resume.is_active == True).first()
 
-    application = Application(
-        company_name=request.company_name,
-        job_title=request.job_title,
-        job_posting_url=request.job_posting_url or "",
+def create_application_from_capture(
+    db: Session,
+    request: CaptureApplicationRequest
+) -> Application:
+    """Create application record from browser extension capture."""
+    _validate_capture_request(request)
+
+    return _build_application(
+        db,
+        request,
+        "browser",
         application_date=date.today(),
-        status="applied",
-        source="browser",
         notes=request.notes,
         needs_review=False,
-        analysis_completed=False,
-        resume_id=active_resume.id if active_resume else None
     )
 
-    db.add(application)
-    db.flush()
-
-    # Record timeline event
-    record_application_created_event(
-        db=db,
-        application_id=application.id,
-        source="browser"
-    )
-    
-    return application
 
 def create_application_from_email(
     db: Session,
     request: EmailIngestRequest
 ) -> Application:
     """Create application record from email ingestion."""
-    # Get active resume
-    active_resume = db.query(Resume).filter(Resume.is_active == True).first()
-
-    application = Application(
-        company_name=request.company_name or "Unknown Company",
-        job_title=request.job_title or "Unknown Position",
-        job_posting_url=request.job_posting_url or "",
+    return _build_application(
+        db,
+        request,
+        "email",
         application_date=request.application_date,
-        status="applied",
-        source="email",
-        notes=f"From: {request.from_email}\nSubject: {request.subject}\n\n{request.body_snippet}",
-        needs_review=True if not request.company_name or not request.job_title else False,
-        analysis_completed=False,
-        resume_id=active_resume.id if active_resume else None
+        notes="".join((
+            "From: ", request.from_email,
+            "\nSubject: ", request.subject,
+            "\n\n", request.body_snippet[:EMAIL_NOTES_BODY_LIMIT],
+        )),
+        needs_review=not request.company_name or not request.job_title,
     )
 
-    db.add(application)
-    db.flush()
-
-    # Record timeline event
-    record_application_created_event(
-        db=db,
-        application_id=application.id,
-        source="email"
-    )
-
-    return application
 
 def update_application_fields(
     db: Session,
@@ -108,11 +142,19 @@ def update_application_fields(
     **fields
 ) -> Application:
     """Update application fields."""
-    for key, value in fields.items():
-        if hasattr(application, key) and value is not None:
-            setattr(application, key, value)
-    
+    values = {
+        key: value
+        for key, value in fields.items()
+        if key in _APPLICATION_WRITABLE and value is not None
+    }
+
+    if values:
+        db.execute(
+            update(Application)
+            .where(Application.id == application.id)
+            .values(**values)
+        )
+
     db.commit()
-    db.refresh(application)
-    
+
     return application
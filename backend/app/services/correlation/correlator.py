@@ -1,15 +1,24 @@
 import logging
 from datetime import timedelta
-from difflib import SequenceMatcher
-from typing import Tuple, Optional
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional
+from rapidfuzz import fuzz, process
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_, or_
-from app.db.models.application import Application
+from sqlalchemy import Row, select, and_, or_, func
+from app.db.models.application import Application, NORM_TRIM_CHARS
 from app.db.models.email import ProcessedEmailUID
 from app.schemas.email import EmailIngestRequest
 
 logger = logging.getLogger(__name__)
 
+# pg_trgm similarity floor for the company prefilter. The extension's default
+# of 0.3 rejects transposition typos ("Stirpe"/"Stripe" scores 0.27) that
+# clear the 0.80 RapidFuzz cutoff applied afterwards.
+COMPANY_TRIGRAM_THRESHOLD = 0.2
+
+# Only the columns fuzzy scoring reads; the full row is loaded for the winner alone
+_SCORING_COLUMNS = (Application.id, Application.company_name_norm, Application.job_title_norm)
+
 
 class CorrelationStrategy:
     EXACT_URL = "exact_url"
@@ -19,11 +28,54 @@ class CorrelationStrategy:
     CREATED_NEW = "created_new"
 
 
+@lru_cache(maxsize=4096)
+def _normalize(value: str) -> str:
+    """
+    Lowercase/strip form used for all comparisons (company names repeat a lot).
+
+    Stored applications carry the same form in company_name_norm and
+    job_title_norm, so only the incoming side is normalized here.
+    """
+    return value.lower().strip(NORM_TRIM_CHARS)
+
+
 def similarity_ratio(a: str, b: str) -> float:
-    """Calculate similarity between two strings."""
+    """
+    Calculate similarity between two strings (0.0-1.0).
+
+    Uses RapidFuzz's normalized Indel similarity. It is never lower than
+    difflib's Ratcliff-Obershelp ratio for the same pair (LCS-based vs. greedy
+    block matching), so existing thresholds are slightly more permissive.
+    The matchers score through _similar_indices instead; this is the
+    single-pair form on the same scale.
+    """
     if not a or not b:
         return 0.0
-    return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio()
+    return fuzz.ratio(_normalize(a), _normalize(b)) / 100.0
+
+
+def clear_normalize_cache() -> None:
+    """Reset memoized normalizations (for tests)."""
+    _normalize.cache_clear()
+
+
+def _similar_indices(query: str, choices: List[str], threshold: float) -> Dict[int, float]:
+    """
+    Score query against every (already normalized) choice in one RapidFuzz call.
+
+    Returns {index: similarity} for choices at or above threshold, on the
+    same scale as similarity_ratio. score_cutoff lets
+    RapidFuzz reject choices whose length alone bounds the ratio below the
+    threshold (2*min/(len_a+len_b)) before comparing any characters.
+    """
+    matches = process.extract(
+        _normalize(query),
+        choices,
+        scorer=fuzz.ratio,
+        score_cutoff=threshold * 100,
+        limit=None,
+    )
+    return {index: score / 100.0 for _, score, index in matches}
 
 
 def correlate_email(
@@ -34,84 +86,35 @@ def correlate_email(
     """
     Correlate email with existing application or create new one.
     
+    Changes are flushed but not committed; the caller owns the transaction.
+    
     Returns:
         Tuple of (Application, strategy_used)
     """
     
-    # Stage A: URL Match (Strongest)
-    if email_request.job_posting_url:
-        application = _match_by_url(db, email_request.job_posting_url)
-        if application:
-            _update_application_from_email(db, application, email_request, email_uid_record)
-            logger.info(
-                f"Correlated email via URL match",
-                extra={
-                    "message_id": email_request.message_id,
-                    "application_id": str(application.id),
-                    "strategy": CorrelationStrategy.EXACT_URL
-                }
-            )
-            return application, CorrelationStrategy.EXACT_URL
-    
-    # Stage B: Company + Title (High Confidence)
-    if email_request.company_name and email_request.job_title:
-        application = _match_by_company_title(
-            db,
-            email_request.company_name,
-            email_request.job_title
-        )
-        if application:
-            _update_application_from_email(db, application, email_request, email_uid_record)
-            logger.info(
-                f"Correlated email via company+title match",
-                extra={
-                    "message_id": email_request.message_id,
-                    "application_id": str(application.id),
-                    "strategy": CorrelationStrategy.FUZZY_COMPANY_TITLE
-                }
-            )
-            return application, CorrelationStrategy.FUZZY_COMPANY_TITLE
-    
-    # Stage C: Title + Date Window (Medium)
-    if email_request.job_title and email_request.application_date:
-        application = _match_by_title_date(
-            db,
-            email_request.job_title,
-            email_request.application_date
-        )
+    # Stages A-D, strongest first; the first strategy that matches wins
+    for strategy, label, applies, match in _STRATEGIES:
+        if not applies(email_request):
+            continue
+        application = match(db, email_request)
         if application:
             _update_application_from_email(db, application, email_request, email_uid_record)
             logger.info(
-                f"Correlated email via title+date match",
+                f"Correlated email via {label} match",
                 extra={
                     "message_id": email_request.message_id,
                     "application_id": str(application.id),
-                    "strategy": CorrelationStrategy.TITLE_DATE
+                    "strategy": strategy
                 }
             )
-            return application, CorrelationStrategy.TITLE_DATE
-    
-    # Stage D: Company-only (Weak)
-    if email_request.company_name:
-        application = _match_by_company(db, email_request.company_name)
-        if application:
-            _update_application_from_email(db, application, email_request, email_uid_record)
-            logger.info(
-                f"Correlated email via company-only match",
-                extra={
-                    "message_id": email_request.message_id,
-                    "application_id": str(application.id),
-                    "strategy": CorrelationStrategy.COMPANY_ONLY
-                }
-            )
-            return application, CorrelationStrategy.COMPANY_ONLY
+            return application, strategy
     
     # Stage E: No Match - Create New Application
     from app.services.application_service import create_application_from_email
     
     application = create_application_from_email(db, email_request)
     email_uid_record.application_id = application.id
-    db.commit()
+    db.flush()
     
     logger.info(
         f"Created new application from email (no correlation)",
@@ -125,7 +128,43 @@ def correlate_email(
     return application, CorrelationStrategy.CREATED_NEW
 
 
-def _match_by_url(db: Session, url: str) -> Optional[Application]:
+# (strategy, log label, applies to request, matcher) in priority order
+_STRATEGIES = (
+    # Stage A: URL Match (Strongest)
+    (
+        CorrelationStrategy.EXACT_URL,
+        "URL",
+        lambda req: req.job_posting_url,
+        lambda db, req: _match_by_url(db, req.job_posting_url),
+    ),
+    # Stage B: Company + Title (High Confidence)
+    (
+        CorrelationStrategy.FUZZY_COMPANY_TITLE,
+        "company+title",
+        lambda req: req.company_name and req.job_title,
+        lambda db, req: _match_by_company_title(db, req.company_name, req.job_title),
+    ),
+    # Stage C: Title + Date Window (Medium)
+    (
+        CorrelationStrategy.TITLE_DATE,
+        "title+date",
+        lambda req: req.job_title and req.application_date,
+        lambda db, req: _match_by_title_date(db, req.job_title, req.application_date),
+    ),
+    # Stage D: Company-only (Weak)
+    (
+        CorrelationStrategy.COMPANY_ONLY,
+        "company-only",
+        lambda req: req.company_name,
+        lambda db, req: _match_by_company(db, req.company_name),
+    ),
+)
+
+
+def _match_by_url(
+    db: Session,
+    url: str
+) -> Optional[Application]:
     """Match application by exact URL."""
     stmt = select(Application).where(
         and_(
@@ -137,28 +176,86 @@ def _match_by_url(db: Session, url: str) -> Optional[Application]:
     return db.execute(stmt).scalar_one_or_none()
 
 
+def _company_candidates(db: Session, company_name: str) -> List[Row]:
+    """
+    Pull (id, company_name_norm, job_title_norm) for applications whose company name is
+    trigram-similar to company_name.
+
+    The pg_trgm % operator is served by the GIN index on company_name; its
+    threshold is lowered to COMPANY_TRIGRAM_THRESHOLD for the current
+    transaction only. This is a recall trade-off, not a lossless filter:
+    trigram similarity and the RapidFuzz ratio disagree most on short names,
+    so a transposed short name ("Meta"/"Mtea" scores 0.11 on trigrams but
+    0.75 with fuzz.ratio) can still be dropped here and go uncorrelated.
+    Longer names with a swapped pair ("goolge"/"google", ~0.27) pass.
+
+    Every row over the threshold is returned. Many applications at one
+    company all score the same, so a LIMIT would drop arbitrary ones,
+    including the single row whose title matches.
+    """
+    # SET LOCAL equivalent; resets when the caller's transaction ends
+    db.execute(select(func.set_config(
+        "pg_trgm.similarity_threshold", str(COMPANY_TRIGRAM_THRESHOLD), True
+    )))
+
+    stmt = select(*_SCORING_COLUMNS).where(
+        Application.is_deleted == False,
+        Application.company_name.op("%")(company_name)
+    )
+
+    return db.execute(stmt).all()
+
+
+def _exact_matches(
+    db: Session,
+    company_name: str,
+    job_title: Optional[str] = None
+) -> List[Row]:
+    """
+    Applications whose normalized company (and title, when given) equal the
+    inputs exactly.
+
+    This is a btree probe on the normalized columns; two rows are
+    enough to tell a unique match from an ambiguous one.
+    """
+    conditions = [
+        Application.is_deleted == False,
+        Application.company_name_norm == _normalize(company_name)
+    ]
+    if job_title is not None:
+        conditions.append(Application.job_title_norm == _normalize(job_title))
+    
+    stmt = select(*_SCORING_COLUMNS).where(*conditions).limit(2)
+    return db.execute(stmt).all()
+
+
+def _resolve(db: Session, match: Row) -> Application:
+    """Load the Application for a projected scoring row."""
+    return db.get(Application, match.id)
+
+
 def _match_by_company_title(
     db: Session,
     company_name: str,
     job_title: str
 ) -> Optional[Application]:
     """Match application by fuzzy company name and job title."""
-    stmt = select(Application).where(
-        Application.is_deleted == False
-    )
+    # Exact (normalized) pairs are the common case and settle it without fuzzy scoring
+    exact = _exact_matches(db, company_name, job_title)
+    if exact:
+        return _resolve(db, exact[0]) if len(exact) == 1 else None
+    
+    applications = _company_candidates(db, company_name)
+    companies = [app.company_name_norm for app in applications]
+    titles = [app.job_title_norm for app in applications]
     
-    applications = db.execute(stmt).scalars().all()
+    company_hits = _similar_indices(company_name, companies, 0.80)
+    title_hits = _similar_indices(job_title, titles, 0.75)
     
-    matches = []
-    for app in applications:
-        company_sim = similarity_ratio(company_name, app.company_name)
-        title_sim = similarity_ratio(job_title, app.job_title)
-        
-        if company_sim >= 0.80 and title_sim >= 0.75:
-            matches.append((app, company_sim + title_sim))
+    matches = [applications[i] for i in company_hits if i in title_hits]
     
     if len(matches) == 1:
-        return matches[0][0]
+        return _resolve(db, matches[0])
     
     return None
 
@@ -172,7 +269,7 @@ def _match_by_title_date(
     date_min = application_date - timedelta(days=2)
     date_max = application_date + timedelta(days=2)
     
-    stmt = select(Application).where(
+    stmt = select(*_SCORING_COLUMNS).where(
         and_(
             Application.application_date >= date_min,
             Application.application_date <= date_max,
@@ -180,36 +277,34 @@ def _match_by_title_date(
         )
     )
     
-    applications = db.execute(stmt).scalars().all()
+    applications = db.execute(stmt).all()
+    titles = [app.job_title_norm for app in applications]
     
-    matches = []
-    for app in applications:
-        title_sim = similarity_ratio(job_title, app.job_title)
-        if title_sim >= 0.75:
-            matches.append(app)
+    matches = _similar_indices(job_title, titles, 0.75)
     
     if len(matches) == 1:
-        return matches[0]
+        return _resolve(db, applications[next(iter(matches))])
     
     return None
 
 
-def _match_by_company(db: Session, company_name: str) -> Optional[Application]:
+def _match_by_company(
+    db: Session,
+    company_name: str
+) -> Optional[Application]:
     """Match application by company name only."""
-    stmt = select(Application).where(
-        Application.is_deleted == False
-    )
+    # Exact (normalized) names are the common case and settle it without fuzzy scoring
+    exact = _exact_matches(db, company_name)
+    if exact:
+        return _resolve(db, exact[0]) if len(exact) == 1 else None
     
-    applications = db.execute(stmt).scalars().all()
+    applications = _company_candidates(db, company_name)
+    companies = [app.company_name_norm for app in applications]
     
-    matches = []
-    for app in applications:
-        company_sim = similarity_ratio(company_name, app.company_name)
-        if company_sim >= 0.80:
-            matches.append(app)
+    matches = _similar_indices(company_name, companies, 0.80)
     
     if len(matches) == 1:
-        return matches[0]
+        return _resolve(db, applications[next(iter(matches))])
     
     return None
 
@@ -241,4 +336,4 @@ def _update_application_from_email(
     # Link email to application
     email_uid_record.application_id = application.id
     
-    db.commit()
+    db.flush()
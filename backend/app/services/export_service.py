@@ -1,8 +1,12 @@
 import logging
+import threading
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func, and_
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional
+from sqlalchemy.orm import Session, defer, selectinload
+from sqlalchemy import select, func, and_, case, literal
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from app.db.models.application import Application
 from app.db.models.job_posting import JobPosting
 from app.db.models.analysis import AnalysisResult
@@ -11,6 +15,39 @@ from app.schemas.export import ExportFilters
 
 logger = logging.getLogger(__name__)
 
+# Export column headers (stable order); rows are lists in this order
+EXPORT_HEADERS = [
+    "Application ID",
+    "Company Name",
+    "Job Title",
+    "Status",
+    "Application Date",
+    "Source",
+    "Job Location",
+    "Job URL",
+    "Employment Type",
+    "Salary Range",
+    "Analysis Match Score",
+    "Qualifications Met",
+    "Qualifications Missing",
+    "Skills Suggestions",
+    "Last Event Type",
+    "Last Event Date",
+    "Notes"
+]
+
+# Rows fetched from the server per round trip while streaming an export
+EXPORT_YIELD_PER = 1000
+
+# Rows sent to the Sheets API per write request
+SHEETS_CHUNK_ROWS = 10000
+
+SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+
+# Sheets clients are built once per thread (the underlying httplib2
+# transport is not thread-safe); credentials are shared
+_sheets_local = threading.local()
+
 
 class ExportError(Exception):
     """Base exception for export operations."""
@@ -20,7 +57,7 @@ class ExportError(Exception):
 def generate_export_rows(
     db: Session,
     filters: ExportFilters
-) -> Tuple[List[str], List[Dict]]:
+) -> Tuple[List[str], Iterator[List]]:
     """
     Generate export data with optional filters.
     
@@ -31,16 +68,24 @@ def generate_export_rows(
     Returns:
         Tuple of (headers, rows) where:
         - headers: List of column names
-        - rows: List of dicts, each representing one application
+        - rows: Iterator of lists in header order, one per application
+        
+    Rows are streamed from the server EXPORT_YIELD_PER at a time, so the
+    iterator must be consumed while the session is still open.
         
     Note: Adjust field mappings in _build_export_row() if schema changes.
     """
     
     # Build query with joins (outer joins to handle missing related data)
+    # Qualification lists are joined into strings by Postgres, so the JSONB
+    # columns themselves are not loaded
     query = select(
         Application,
         JobPosting,
-        AnalysisResult
+        AnalysisResult,
+        _jsonb_join(AnalysisResult.qualifications_met),
+        _jsonb_join(AnalysisResult.qualifications_missing),
+        _jsonb_join(AnalysisResult.suggestions)
     ).select_from(Application).outerjoin(
         JobPosting,
         Application.posting_id == JobPosting.id
@@ -49,6 +94,15 @@ def generate_export_rows(
         Application.analysis_id == AnalysisResult.id
     ).where(
         Application.is_deleted == False
+    ).options(
+        defer(AnalysisResult.qualifications_met),
+        defer(AnalysisResult.qualifications_missing),
+        defer(AnalysisResult.suggestions),
+        # One extra IN query per streamed partition for the last-event columns
+        selectinload(Application.timeline_events).load_only(
+            TimelineEvent.event_type,
+            TimelineEvent.occurred_at
+        )
     )
     
     # Apply filters
@@ -58,7 +112,8 @@ def generate_export_rows(
         conditions.append(Application.status == filters.status)
     
     if filters.company_name:
-        # Partial match, case-insensitive
+        # Partial match, case-insensitive; served by the company_name trigram
+        # index (idx_applications_company_name_trgm) despite the leading wildcard
         conditions.append(
             Application.company_name.ilike(f"%{filters.company_name}%")
         )
@@ -75,107 +130,70 @@ def generate_export_rows(
     # Order by application date (newest first)
     query = query.order_by(Application.application_date.desc())
     
-    # Execute query
-    results = db.execute(query).all()
-    
-    # Get timeline data for each application (most recent event)
-    application_ids = [row[0].id for row in results]
-    timeline_data = _get_timeline_summary(db, application_ids)
-    
-    # Define column headers (stable order)
-    headers = [
-        "Application ID",
-        "Company Name",
-        "Job Title",
-        "Status",
-        "Application Date",
-        "Source",
-        "Job Location",
-        "Job URL",
-        "Employment Type",
-        "Salary Range",
-        "Analysis Match Score",
-        "Qualifications Met",
-        "Qualifications Missing",
-        "Skills Suggestions",
-        "Last Event Type",
-        "Last Event Date",
-        "Notes"
-    ]
+    return list(EXPORT_HEADERS), _iter_export_rows(db, query, filters)
+
+
+def _jsonb_join(column):
+    """SQL expression joining a JSONB array's elements with ', ' ('' if not an array)."""
+    elements = func.jsonb_array_elements_text(column).table_valued(
+        "value",
+        with_ordinality="ordinality"
+    )
+    joined = select(
+        func.string_agg(elements.c.value, aggregate_order_by(literal(", "), elements.c.ordinality))
+    ).select_from(elements).scalar_subquery()
     
-    # Build export rows
-    rows = []
-    for application, job_posting, analysis in results:
-        row_data = _build_export_row(
+    return case(
+        (func.jsonb_typeof(column) == "array", func.coalesce(joined, "")),
+        else_=""
+    )
+
+
+def _iter_export_rows(db: Session, query, filters: ExportFilters) -> Iterator[List]:
+    """Stream export rows from the server EXPORT_YIELD_PER at a time."""
+    row_count = 0
+    
+    result = db.execute(query.execution_options(yield_per=EXPORT_YIELD_PER))
+    for application, job_posting, analysis, *qualifications in result:
+        # Most recent timeline event (timeline_events is selectin-loaded)
+        last_event = max(
+            application.timeline_events,
+            key=lambda event: event.occurred_at,
+            default=None
+        )
+        
+        yield _build_export_row(
             application,
             job_posting,
             analysis,
-            timeline_data.get(application.id)
+            last_event,
+            *qualifications
         )
-        rows.append(row_data)
+        row_count += 1
     
     logger.info(
-        f"Generated export with {len(rows)} rows",
+        f"Generated export with {row_count} rows",
         extra={
             "filters": filters.dict(exclude_none=True),
-            "row_count": len(rows)
+            "row_count": row_count
         }
     )
-    
-    return headers, rows
-
-
-def _get_timeline_summary(
-    db: Session,
-    application_ids: List
-) -> Dict:
-    """
-    Get most recent timeline event for each application.
-    
-    Returns:
-        Dict mapping application_id -> {event_type, occurred_at}
-    """
-    if not application_ids:
-        return {}
-    
-    # Subquery to get most recent event per application
-    subq = select(
-        TimelineEvent.application_id,
-        func.max(TimelineEvent.occurred_at).label('max_occurred_at')
-    ).where(
-        TimelineEvent.application_id.in_(application_ids)
-    ).group_by(
-        TimelineEvent.application_id
-    ).subquery()
-    
-    # Get the actual events
-    query = select(TimelineEvent).join(
-        subq,
-        and_(
-            TimelineEvent.application_id == subq.c.application_id,
-            TimelineEvent.occurred_at == subq.c.max_occurred_at
-        )
-    )
-    
-    events = db.execute(query).scalars().all()
-    
-    return {
-        event.application_id: {
-            'event_type': event.event_type,
-            'occurred_at': event.occurred_at
-        }
-        for event in events
-    }
 
 
 def _build_export_row(
     application: Application,
     job_posting: Optional[JobPosting],
     analysis: Optional[AnalysisResult],
-    timeline_summary: Optional[Dict]
-) -> Dict:
+    last_event: Optional[TimelineEvent],
+    qualifications_met: str = "",
+    qualifications_missing: str = "",
+    suggestions: str = ""
+) -> List:
     """
-    Build a flat dictionary for one application row.
+    Build one application row as a list in EXPORT_HEADERS order.
+    
+    The qualification/suggestion columns arrive pre-joined as comma-separated
+    strings (see _jsonb_join).
     
     Note: Adjust these field mappings if your schema changes:
     - Application fields: company_name, job_title, status, etc.
@@ -183,46 +201,80 @@ def _build_export_row(
     - AnalysisResult fields: match_score, qualifications_met, etc.
     """
     
-    # Format qualifications as comma-separated strings
-    qualifications_met = ""
-    qualifications_missing = ""
-    suggestions = ""
-    
-    if analysis:
-        if isinstance(analysis.qualifications_met, list):
-            qualifications_met = ", ".join(analysis.qualifications_met)
-        if isinstance(analysis.qualifications_missing, list):
-            qualifications_missing = ", ".join(analysis.qualifications_missing)
-        if isinstance(analysis.suggestions, list):
-            suggestions = ", ".join(analysis.suggestions)
-    
-    # Build the row
-    row = {
-        "Application ID": str(application.id),
-        "Company Name": application.company_name or "",
-        "Job Title": application.job_title or "",
-        "Status": application.status or "",
-        "Application Date": application.application_date.isoformat() if application.application_date else "",
-        "Source": application.source or "",
-        "Job Location": job_posting.location if job_posting else "",
-        "Job URL": application.job_posting_url or "",
-        "Employment Type": job_posting.employment_type if job_posting else "",
-        "Salary Range": job_posting.salary_range if job_posting else "",
-        "Analysis Match Score": analysis.match_score if analysis else "",
-        "Qualifications Met": qualifications_met,
-        "Qualifications Missing": qualifications_missing,
-        "Skills Suggestions": suggestions,
-        "Last Event Type": timeline_summary.get('event_type', '') if timeline_summary else "",
-        "Last Event Date": timeline_summary.get('occurred_at').isoformat() if timeline_summary and timeline_summary.get('occurred_at') else "",
-        "Notes": application.notes or ""
-    }
+    # Build the row (same order as EXPORT_HEADERS)
+    row = [
+        str(application.id),  # Application ID
+        application.company_name or "",  # Company Name
+        application.job_title or "",  # Job Title
+        application.status or "",  # Status
+        application.application_date.isoformat() if application.application_date else "",  # Application Date
+        application.source or "",  # Source
+        job_posting.location if job_posting else "",  # Job Location
+        application.job_posting_url or "",  # Job URL
+        job_posting.employment_type if job_posting else "",  # Employment Type
+        job_posting.salary_range if job_posting else "",  # Salary Range
+        analysis.match_score if analysis else "",  # Analysis Match Score
+        qualifications_met,  # Qualifications Met
+        qualifications_missing,  # Qualifications Missing
+        suggestions,  # Skills Suggestions
+        last_event.event_type if last_event else "",  # Last Event Type
+        last_event.occurred_at.isoformat() if last_event and last_event.occurred_at else "",  # Last Event Date
+        application.notes or "",  # Notes
+    ]
     
     return row
 
 
+def _require_sheets_client() -> None:
+    """
+    Fail fast with an ExportError if the Google client libraries are missing.
+
+    The credential and service helpers import them lazily, so check up front
+    rather than surfacing a bare ImportError mid-sync.
+    """
+    try:
+        import google.oauth2.service_account  # noqa: F401
+        import googleapiclient.discovery  # noqa: F401
+    except ImportError:
+        raise ExportError(
+            "Google API client not installed. "
+            "Install with: pip install google-api-python-client google-auth"
+        )
+
+
+@lru_cache(maxsize=1)
+def _load_sheets_credentials(credentials_path: str):
+    """Parse the service account file once per path."""
+    from google.oauth2 import service_account
+    
+    return service_account.Credentials.from_service_account_file(
+        credentials_path,
+        scopes=SHEETS_SCOPES
+    )
+
+
+def _get_sheets_service(credentials_path: str):
+    """Return this thread's Sheets API service, building it on first use."""
+    cached = getattr(_sheets_local, 'service', None)
+    if cached is not None and cached[0] == credentials_path:
+        return cached[1]
+    
+    from googleapiclient.discovery import build
+    
+    service = build(
+        'sheets',
+        'v4',
+        credentials=_load_sheets_credentials(credentials_path),
+        cache_discovery=False,
+        static_discovery=True
+    )
+    _sheets_local.service = (credentials_path, service)
+    return service
+
+
 def sync_to_google_sheets(
     headers: List[str],
-    rows: List[Dict],
+    rows: Iterable,
     sheet_id: str,
     worksheet_name: str = "Applications",
     credentials_path: Optional[str] = None
@@ -232,7 +284,7 @@ def sync_to_google_sheets(
     
     Args:
         headers: Column headers
-        rows: Data rows (list of dicts)
+        rows: Data rows in header order (lists or dicts, consumed once)
         sheet_id: Google Sheets spreadsheet ID
         worksheet_name: Worksheet/tab name
         credentials_path: Path to service account JSON (optional, uses env var if None)
@@ -244,18 +296,12 @@ def sync_to_google_sheets(
         ExportError: If Google Sheets sync fails
         
     Note: Requires google-api-python-client installed and service account credentials.
-    Strategy: Clears existing data in worksheet, then writes headers + all rows.
+    Strategy: Clears existing data in worksheet, then writes headers + rows in
+    chunks of SHEETS_CHUNK_ROWS.
     """
     
-    try:
-        from google.oauth2 import service_account
-        from googleapiclient.discovery import build
-        from googleapiclient.errors import HttpError
-    except ImportError:
-        raise ExportError(
-            "Google API client not installed. "
-            "Install with: pip install google-api-python-client google-auth"
-        )
+    _require_sheets_client()
+    from googleapiclient.errors import HttpError
     
     # Get credentials
     if credentials_path is None:
@@ -269,20 +315,8 @@ def sync_to_google_sheets(
             )
     
     try:
-        # Load service account credentials
-        SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-        credentials = service_account.Credentials.from_service_account_file(
-            credentials_path,
-            scopes=SCOPES
-        )
-        
-        # Build Sheets API service
-        service = build('sheets', 'v4', credentials=credentials)
-        
-        # Prepare data: headers + rows
-        # Convert row dicts to lists in same order as headers
-        data_rows = [[row.get(header, "") for header in headers] for row in rows]
-        all_data = [headers] + data_rows
+        # Reuse credentials and the Sheets API service across syncs
+        service = _get_sheets_service(credentials_path)
         
         # Clear existing data in worksheet
         clear_range = f"{worksheet_name}!A:Z"  # Adjust if you need more columns
@@ -312,22 +346,36 @@ def sync_to_google_sheets(
                     # Worksheet might already exist, continue
                     pass
         
-        # Write data to worksheet
-        update_range = f"{worksheet_name}!A1"
-        body = {
-            'values': all_data,
-            'majorDimension': 'ROWS'
-        }
-        
-        result = service.spreadsheets().values().update(
-            spreadsheetId=sheet_id,
-            range=update_range,
-            valueInputOption='RAW',
-            body=body
-        ).execute()
+        # Write data to worksheet, one batchUpdate per chunk at explicit row
+        # offsets (no table detection on the server side as with append)
+        # Rows from generate_export_rows are already lists in header order;
+        # dicts are still accepted and converted
+        data_rows = (
+            [row.get(header, "") for header in headers] if isinstance(row, dict) else row
+            for row in rows
+        )
+        chunk = [headers] + list(islice(data_rows, SHEETS_CHUNK_ROWS - 1))
+        start_row = 1
+        updated_cells = 0
+        updated_rows = len(chunk) - 1
         
-        updated_cells = result.get('updatedCells', 0)
-        updated_rows = len(data_rows)
+        while chunk:
+            result = service.spreadsheets().values().batchUpdate(
+                spreadsheetId=sheet_id,
+                body={
+                    'valueInputOption': 'RAW',
+                    'data': [{
+                        'range': f"{worksheet_name}!A{start_row}",
+                        'values': chunk,
+                        'majorDimension': 'ROWS'
+                    }]
+                }
+            ).execute()
+            updated_cells += result.get('totalUpdatedCells', 0)
+            start_row += len(chunk)
+            
+            chunk = list(islice(data_rows, SHEETS_CHUNK_ROWS))
+            updated_rows += len(chunk)
         
         logger.info(
             f"Successfully synced to Google Sheets",
@@ -5,11 +5,23 @@ Provides explicit, rule-based industry mapping based on job titles and descripti
 NO silent defaults - jobs that can't be classified are marked as 'unknown'.
 """
 import logging
-from typing import Optional, Dict, Set
+import sys
+from array import array
+from functools import lru_cache
+from typing import Iterable, Optional, Dict, List, Set, Tuple
 import re
 
 logger = logging.getLogger(__name__)
 
+# Distinct (title, description) pairs remembered by _best_industry
+CLASSIFICATION_CACHE_SIZE = 1024
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+    logger.warning("pyahocorasick not installed, industry classification will scan keywords one by one")
+
 # Industry classification rules - explicit keyword mappings
 # Each industry has required keywords (any match) and optional exclusions
 INDUSTRY_RULES = {
@@ -164,6 +176,158 @@ INDUSTRY_RULES = {
 }
 
 
+def _compile_title_keywords(keywords: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Lowercase, intern and sort one industry's title keywords longest first.
+
+    Keywords containing another keyword of the same industry are dropped:
+    only one title hit per industry counts, and the shorter keyword matches
+    whenever the longer one would (e.g. 'registered nurse' vs 'nurse').
+    """
+    lowered = sorted(dict.fromkeys(sys.intern(k.lower()) for k in keywords), key=len, reverse=True)
+    return tuple(
+        keyword for keyword in lowered
+        if not any(other != keyword and other in keyword for other in lowered)
+    )
+
+
+# Industries by position; scores are lists indexed by these positions
+_INDUSTRY_NAMES = tuple(INDUSTRY_RULES)
+_INDUSTRY_COUNT = len(_INDUSTRY_NAMES)
+_INDUSTRY_INDEX = {industry: index for index, industry in enumerate(_INDUSTRY_NAMES)}
+
+# Title keywords per industry after _compile_title_keywords
+_TITLE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    industry: _compile_title_keywords(rules.get("title_keywords", []))
+    for industry, rules in INDUSTRY_RULES.items()
+}
+
+
+def _build_automaton(keywords_by_industry: Dict[str, Iterable[str]]):
+    """
+    Build one Aho-Corasick automaton over every industry's keywords for a field.
+
+    Each keyword maps to (keyword_id, owning industry positions); a keyword listed by
+    several industries (or twice by one) counts for each listing, as the
+    per-keyword scan did.
+
+    The automaton is a character trie keyed by keyword -> industries with
+    failure links, so one left-to-right walk finds every keyword occurrence,
+    including those starting mid-word.
+    """
+    owners: Dict[str, list] = {}
+    for industry, keywords in keywords_by_industry.items():
+        for keyword in keywords:
+            owners.setdefault(keyword.lower(), []).append(_INDUSTRY_INDEX[industry])
+
+    automaton = ahocorasick.Automaton()
+    for keyword_id, (keyword, industries) in enumerate(owners.items()):
+        automaton.add_word(keyword, (keyword_id, tuple(industries)))
+    automaton.make_automaton()
+    return automaton
+
+
+if ahocorasick is not None:
+    _TITLE_AUTOMATON = _build_automaton(_TITLE_KEYWORDS)
+    _DESC_AUTOMATON = _build_automaton({
+        industry: rules.get("description_keywords", [])
+        for industry, rules in INDUSTRY_RULES.items()
+    })
+else:
+    _TITLE_AUTOMATON = _DESC_AUTOMATON = None
+
+
+# Fallback title matching: one alternation per industry, longest keywords first.
+# Plain substring semantics (no \b), matching the automaton path.
+_TITLE_RES: Tuple[Tuple[int, "re.Pattern[str]"], ...] = tuple(
+    (_INDUSTRY_INDEX[industry], re.compile("|".join(map(re.escape, keywords))))
+    for industry, keywords in _TITLE_KEYWORDS.items()
+    if keywords
+)
+
+
+# Fallback description matching: every description keyword in one flat,
+# pre-lowercased tuple with a parallel array of owning industry positions
+_DESC_KEYWORDS = tuple(
+    keyword.lower()
+    for rules in INDUSTRY_RULES.values()
+    for keyword in rules.get("description_keywords", [])
+)
+_DESC_INDUSTRY = array("B", [
+    index
+    for index, rules in enumerate(INDUSTRY_RULES.values())
+    for _ in rules.get("description_keywords", [])
+])
+
+
+def _title_matches(title_lower: str) -> List[int]:
+    """Positions of industries with a title keyword in the title, ascending."""
+    if _TITLE_AUTOMATON is not None:
+        hits = {
+            index
+            for _, (_, industries) in _TITLE_AUTOMATON.iter(title_lower)
+            for index in industries
+        }
+    else:
+        hits = {
+            index
+            for index, title_re in _TITLE_RES
+            if title_re.search(title_lower)
+        }
+
+    return sorted(hits)
+
+
+def _description_counts(desc_lower: str, contenders: List[int]) -> List[int]:
+    """
+    Number of distinct description keywords found, per industry position.
+
+    Only the contenders' keywords are counted, and the fallback scan stops
+    counting an industry once it reaches the cap of 5.
+    """
+    counts = [0] * _INDUSTRY_COUNT
+    wanted = set(contenders)
+
+    if _DESC_AUTOMATON is not None:
+        matched: Dict[int, Tuple[int, ...]] = {
+            keyword_id: industries
+            for _, (keyword_id, industries) in _DESC_AUTOMATON.iter(desc_lower)
+        }
+        for industries in matched.values():
+            for index in industries:
+                if index in wanted:
+                    counts[index] += 1
+    else:
+        for keyword, index in zip(_DESC_KEYWORDS, _DESC_INDUSTRY):
+            if index in wanted and counts[index] < 5 and keyword in desc_lower:
+                counts[index] += 1
+
+    return counts
+
+
+@lru_cache(maxsize=CLASSIFICATION_CACHE_SIZE)
+def _best_industry(title_lower: str, desc_lower: str) -> Tuple[Optional[str], int]:
+    """
+    Highest-scoring industry and its score for lowercased inputs.
+
+    Returns (None, 0) when no title keyword matched. Postings repeat titles
+    and descriptions across ingestion batches, so results are memoized.
+    """
+    # A title match scores 10 and description evidence at most 5, so an
+    # industry without a title match never reaches the threshold, and a lone
+    # title match cannot be overtaken: the description only breaks ties
+    contenders = _title_matches(title_lower)
+    if not contenders:
+        return None, 0
+    if len(contenders) == 1 or not desc_lower:
+        return _INDUSTRY_NAMES[contenders[0]], 10
+
+    # Each description keyword adds 1 point, max 5; ties keep INDUSTRY_RULES order
+    desc_counts = _description_counts(desc_lower, contenders)
+    best = max(contenders, key=lambda index: min(desc_counts[index], 5))
+    return _INDUSTRY_NAMES[best], 10 + min(desc_counts[best], 5)
+
+
 def classify_industry(job_title: str, job_description: str = "") -> str:
     """
     Classify job industry based on explicit rules.
@@ -185,48 +349,44 @@ def classify_industry(job_title: str, job_description: str = "") -> str:
     title_lower = job_title.lower()
     desc_lower = job_description.lower() if job_description else ""
 
-    # Track industry scores
-    industry_scores: Dict[str, int] = {}
-
-    for industry, rules in INDUSTRY_RULES.items():
-        score = 0
-
-        # Check title keywords (weighted higher)
-        for keyword in rules.get("title_keywords", []):
-            if keyword.lower() in title_lower:
-                score += 10  # Strong signal from title
-                break  # One title match is enough
-
-        # Check description keywords (supporting evidence)
-        desc_keywords = rules.get("description_keywords", [])
-        if desc_keywords and desc_lower:
-            matched_desc_keywords = sum(
-                1 for keyword in desc_keywords
-                if keyword.lower() in desc_lower
-            )
-            # Each description keyword adds 1 point, max 5
-            score += min(matched_desc_keywords, 5)
-
-        if score > 0:
-            industry_scores[industry] = score
-
-    # Return industry with highest score, or 'unknown' if no matches
-    if not industry_scores:
-        logger.info(f"No industry classification for: {job_title[:50]}")
-        return "unknown"
+    best_industry, best_score = _best_industry(title_lower, desc_lower)
 
-    best_industry = max(industry_scores, key=industry_scores.get)
-    best_score = industry_scores[best_industry]
-
-    # Require minimum score threshold (at least one title match or strong desc evidence)
-    if best_score < 10:
-        logger.info(f"Industry classification uncertain for: {job_title[:50]} (score={best_score})")
+    # Return industry with highest score, or 'unknown' if no title matched
+    if best_industry is None:
+        logger.info(f"No industry classification for: {job_title[:50]}")
         return "unknown"
 
     logger.debug(f"Classified '{job_title[:50]}' as '{best_industry}' (score={best_score})")
     return best_industry
 
 
+def classify_industry_batch(jobs: Iterable[Tuple[str, str]]) -> List[str]:
+    """
+    Classify many jobs at once with the same rules as classify_industry.
+
+    Args:
+        jobs: (job_title, job_description) pairs
+
+    Returns:
+        Industry name or 'unknown' per job, in input order
+    """
+    lowered = [
+        (title.lower() if title else "", desc.lower() if desc else "")
+        for title, desc in jobs
+    ]
+
+    results = [
+        _best_industry(title_lower, desc_lower)[0] or "unknown" if title_lower else "unknown"
+        for title_lower, desc_lower in lowered
+    ]
+
+    logger.debug(
+        f"Classified {len(results)} jobs in batch "
+        f"({results.count('unknown')} unknown)"
+    )
+    return results
+
+
 def get_supported_industries() -> Set[str]:
     """
     Get list of industries that can be classified.
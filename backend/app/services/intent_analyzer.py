@@ -5,15 +5,152 @@ Analyzes resumes to extract career intent profiles that inform job matching.
 Goes beyond skills to understand what kind of role the candidate is targeting.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Dict, List, Optional
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import func, or_, update
 from sqlalchemy.orm import Session
 
+from ..db.models.resume import ResumeData
 from ..services.analysis.llm_client import LLMClient, LLMSettings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+    logger.warning("pyahocorasick not installed, intent alignment will scan keywords one by one")
+
+# Max number of resume fingerprints kept in the in-process profile cache
+PROFILE_CACHE_SIZE = 256
+
+# Characters of the summary that count towards the resume fingerprint
+FINGERPRINT_SUMMARY_CHARS = 500
+
+# Most recent job titles the archetype title gate looks at
+GATE_TITLE_COUNT = 3
+
+# Titles that must agree on an archetype before the LLM call is skipped
+GATE_MIN_VOTES = 2
+
+# Confidence of a gated profile when every considered title agrees
+GATE_CONFIDENCE = 0.85
+
+# Cheap-model profiles below this confidence are redone with the main model
+ESCALATION_CONFIDENCE = 0.5
+
+# Cheap-tier outcome counters, for tuning ESCALATION_CONFIDENCE
+_tier_stats = {"calls": 0, "escalations": 0}
+_tier_stats_lock = threading.Lock()
+
+# Outermost JSON object in an LLM response
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Distinct (title, description) pairs whose normalized text is remembered
+JOB_TEXT_CACHE_SIZE = 1024
+
+
+# Core role archetypes (industry-agnostic)
+ROLE_ARCHETYPES = [
+    "solutions_engineer",
+    "integration_engineer",
+    "systems_engineer",
+    "platform_engineer",
+    "product_engineer",
+    "frontend_engineer",
+    "backend_engineer",
+    "fullstack_engineer",
+    "data_engineer",
+    "ml_engineer",
+    "devops_engineer",
+    "security_engineer",
+    "mobile_engineer",
+    "embedded_engineer",
+    "analyst",
+    "strategist",
+    "technical_lead",
+    "engineering_manager",
+    "product_manager",
+    "technical_writer"
+]
+
+# Typical work orientation per archetype, for profiles inferred from job
+# titles alone (customer_facing, cross_system, integration_heavy,
+# product_adjacent, hands_on_technical, external_communication)
+ARCHETYPE_DEFAULT_ORIENTATION: Dict[str, Dict[str, float]] = {
+    archetype: dict(zip(
+        ("customer_facing", "cross_system", "integration_heavy",
+         "product_adjacent", "hands_on_technical", "external_communication"),
+        scores
+    ))
+    for archetype, scores in {
+        "solutions_engineer": (0.9, 0.7, 0.7, 0.5, 0.7, 0.9),
+        "integration_engineer": (0.5, 0.9, 0.9, 0.4, 0.8, 0.5),
+        "systems_engineer": (0.2, 0.8, 0.6, 0.3, 0.9, 0.3),
+        "platform_engineer": (0.1, 0.7, 0.5, 0.3, 0.9, 0.2),
+        "product_engineer": (0.3, 0.4, 0.4, 0.9, 0.8, 0.3),
+        "frontend_engineer": (0.3, 0.3, 0.3, 0.8, 0.9, 0.2),
+        "backend_engineer": (0.1, 0.5, 0.5, 0.5, 0.9, 0.2),
+        "fullstack_engineer": (0.3, 0.5, 0.4, 0.7, 0.9, 0.3),
+        "data_engineer": (0.1, 0.7, 0.7, 0.3, 0.9, 0.2),
+        "ml_engineer": (0.1, 0.5, 0.4, 0.5, 0.9, 0.2),
+        "devops_engineer": (0.1, 0.8, 0.6, 0.2, 0.9, 0.2),
+        "security_engineer": (0.2, 0.8, 0.5, 0.2, 0.8, 0.3),
+        "mobile_engineer": (0.2, 0.3, 0.4, 0.8, 0.9, 0.2),
+        "embedded_engineer": (0.1, 0.5, 0.5, 0.4, 0.9, 0.1),
+        "analyst": (0.4, 0.5, 0.3, 0.5, 0.5, 0.5),
+        "strategist": (0.6, 0.6, 0.2, 0.6, 0.2, 0.8),
+        "technical_lead": (0.3, 0.7, 0.5, 0.6, 0.8, 0.5),
+        "engineering_manager": (0.3, 0.6, 0.3, 0.6, 0.3, 0.6),
+        "product_manager": (0.7, 0.6, 0.3, 0.9, 0.3, 0.8),
+        "technical_writer": (0.5, 0.5, 0.3, 0.6, 0.4, 0.8),
+    }.items()
+}
+
+# Everything in the intent prompt that does not depend on the resume. Kept
+# byte-identical across calls so the resume block is the only variable part.
+INTENT_PROMPT_PREFIX = """You are a career intent analyzer. Decide what role this resume is TARGETING, not just which skills it lists.
+
+ARCHETYPES: """ + ", ".join(ROLE_ARCHETYPES) + """
+
+DEPRIORITIZE CATEGORIES: strategy_only, analytics_only, management_only, sales_oriented, non_technical
+
+OUTPUT (JSON only):
+{
+  "primary_archetype": "<one ARCHETYPE>",
+  "archetype_confidence": <0..1>,
+  "secondary_archetypes": ["<1-3 adjacent ARCHETYPES, best first>"],
+  "work_orientation": {
+    "customer_facing": <0..1>,
+    "cross_system": <0..1>,
+    "integration_heavy": <0..1>,
+    "product_adjacent": <0..1>,
+    "hands_on_technical": <0..1>,
+    "external_communication": <0..1>
+  },
+  "soft_deprioritize": ["<DEPRIORITIZE CATEGORIES to rank lower, not exclude>"],
+  "reasoning": "<2-3 sentences on the primary archetype>"
+}
+
+CONSTRAINTS:
+- Weight titles, responsibilities and progression over skills.
+- Customer-facing solutions work is not platform work.
+- Integrating systems is not building them.
+- Weight verbs: implemented, architected, collaborated with customers, drove adoption.
+- Ignore industry; judge work patterns.
+- Senior ICs are not managers unless titles/duties show people management.
+- Ignore buzzwords; judge actual work done.
+- Return minified JSON on one line and nothing else.
+"""
+
 
 class IntentProfile:
     """Structured representation of resume career intent"""
@@ -60,28 +197,20 @@ class IntentAnalyzer:
     """Analyzes resume to extract career intent profile"""
 
     # Core role archetypes (industry-agnostic)
-    ROLE_ARCHETYPES = [
-        "solutions_engineer",
-        "integration_engineer",
-        "systems_engineer",
-        "platform_engineer",
-        "product_engineer",
-        "frontend_engineer",
-        "backend_engineer",
-        "fullstack_engineer",
-        "data_engineer",
-        "ml_engineer",
-        "devops_engineer",
-        "security_engineer",
-        "mobile_engineer",
-        "embedded_engineer",
-        "analyst",
-        "strategist",
-        "technical_lead",
-        "engineering_manager",
-        "product_manager",
-        "technical_writer"
-    ]
+    ROLE_ARCHETYPES = ROLE_ARCHETYPES
+
+    # Keys every intent response must contain
+    REQUIRED_FIELDS = (
+        "primary_archetype",
+        "archetype_confidence",
+        "secondary_archetypes",
+        "work_orientation",
+        "soft_deprioritize",
+        "reasoning"
+    )
+
+    # resume fingerprint -> profile dict, shared across analyzer instances
+    _profile_cache: Dict[str, dict] = {}
 
     def __init__(self, llm_client: Optional[LLMClient] = None):
         """
@@ -111,37 +240,296 @@ class IntentAnalyzer:
         """
         logger.info(f"Analyzing intent for resume {resume_id}")
 
-        # Check cache first
-        cached_profile = self._get_cached_profile(db, resume_id)
+        cached_profile, fingerprint = self._lookup_profile(db, resume_id, resume_data)
         if cached_profile:
-            logger.info(f"Using cached intent profile for resume {resume_id}")
             return cached_profile
 
         # Build LLM prompt
-        prompt = self._build_intent_prompt(resume_data)
+        prefix, prompt = self._build_intent_prompt(resume_data)
 
-        # Call LLM
+        # Call LLM, cheap model first
         try:
-            response = self.llm_client.analyze(prompt)
-            profile = self._parse_intent_response(response)
+            profile = None
+            if self._use_cheap_tier():
+                try:
+                    response = self.llm_client.analyze(
+                        prompt, prefix=prefix, model=self.llm_client.cheap_model
+                    )
+                except Exception as e:
+                    response = None
+                    logger.warning(f"Cheap-tier intent analysis failed for {resume_id}: {e}")
+                profile = self._accept_cheap_tier(response)
+
+            if profile is None:
+                profile = self._parse_intent_response(
+                    self.llm_client.analyze(prompt, prefix=prefix)
+                )
+            return self._complete_profile(db, resume_id, fingerprint, profile)
 
-            # Cache result
-            self._cache_profile(db, resume_id, profile)
+        except Exception as e:
+            logger.error(f"Intent analysis failed for {resume_id}: {e}")
+            # Return default profile on error
+            return self._default_profile()
 
-            logger.info(
-                f"Intent analysis complete for {resume_id}: "
-                f"{profile.primary_archetype} ({profile.archetype_confidence:.2f})"
+    async def aanalyze_resume_intent(
+        self,
+        resume_data: dict,
+        db: Session,
+        resume_id: str,
+        db_lock: Optional[asyncio.Lock] = None
+    ) -> IntentProfile:
+        """
+        Async version of analyze_resume_intent.
+
+        Database work runs in a thread so it does not block the event loop;
+        pass db_lock when several coroutines share the session.
+        """
+        db_lock = db_lock or asyncio.Lock()
+        logger.info(f"Analyzing intent for resume {resume_id}")
+
+        async with db_lock:
+            cached_profile, fingerprint = await asyncio.to_thread(
+                self._lookup_profile, db, resume_id, resume_data
             )
+        if cached_profile:
+            return cached_profile
 
-            return profile
+        prefix, prompt = self._build_intent_prompt(resume_data)
+
+        try:
+            profile = None
+            if self._use_cheap_tier():
+                try:
+                    response = await self.llm_client.aanalyze(
+                        prompt, prefix=prefix, model=self.llm_client.cheap_model
+                    )
+                except Exception as e:
+                    response = None
+                    logger.warning(f"Cheap-tier intent analysis failed for {resume_id}: {e}")
+                profile = self._accept_cheap_tier(response)
+
+            if profile is None:
+                profile = self._parse_intent_response(
+                    await self.llm_client.aanalyze(prompt, prefix=prefix)
+                )
+            async with db_lock:
+                return await asyncio.to_thread(
+                    self._complete_profile, db, resume_id, fingerprint, profile
+                )
 
         except Exception as e:
             logger.error(f"Intent analysis failed for {resume_id}: {e}")
-            # Return default profile on error
             return self._default_profile()
 
-    def _build_intent_prompt(self, resume_data: dict) -> str:
-        """Build LLM prompt for intent extraction"""
+    async def analyze_many(
+        self,
+        resumes: List[Tuple[str, dict]],
+        db: Session,
+        concurrency: int = 16
+    ) -> List[IntentProfile]:
+        """
+        Analyze several resumes with up to `concurrency` LLM calls in flight.
+
+        Args:
+            resumes: (resume_id, resume_data) pairs
+            db: Database session, shared by all analyses
+            concurrency: Maximum number of simultaneous LLM calls
+
+        Returns:
+            Profiles in the same order as resumes
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        db_lock = asyncio.Lock()
+
+        async def analyze_one(resume_id: str, resume_data: dict) -> IntentProfile:
+            async with semaphore:
+                return await self.aanalyze_resume_intent(resume_data, db, resume_id, db_lock)
+
+        return await asyncio.gather(
+            *(analyze_one(resume_id, resume_data) for resume_id, resume_data in resumes)
+        )
+
+    def _lookup_profile(
+        self,
+        db: Session,
+        resume_id: str,
+        resume_data: dict
+    ) -> Tuple[Optional[IntentProfile], str]:
+        """
+        Resolve a profile without the LLM: stored profile, equivalent resume,
+        then the title gate. Returns (profile or None, resume fingerprint).
+        """
+        # Check cache first
+        cached_profile = self._get_cached_profile(db, resume_id)
+        if cached_profile:
+            logger.info(f"Using cached intent profile for resume {resume_id}")
+            return cached_profile, ""
+
+        # Resumes that differ only in formatting or ordering share a profile
+        fingerprint = self._resume_fingerprint(resume_data)
+        cached_profile = self._profile_cache_lookup(fingerprint)
+        if cached_profile:
+            logger.info(f"Reusing intent profile of an equivalent resume for {resume_id}")
+            return self._cache_profile(db, resume_id, cached_profile), fingerprint
+
+        # Unambiguous careers don't need the LLM
+        gated_profile = self._title_gate_profile(resume_data)
+        if gated_profile:
+            logger.info(
+                f"Job titles settle intent for resume {resume_id}: {gated_profile.primary_archetype}"
+            )
+            gated_profile = self._cache_profile(db, resume_id, gated_profile)
+            self._profile_cache_store(fingerprint, gated_profile)
+        return gated_profile, fingerprint
+
+    def _use_cheap_tier(self) -> bool:
+        """Whether a distinct low-cost model is configured to try first."""
+        cheap_model = getattr(self.llm_client, "cheap_model", None)
+        return bool(cheap_model) and cheap_model != self.llm_client.model
+
+    def _accept_cheap_tier(self, response: Optional[str]) -> Optional[IntentProfile]:
+        """
+        Parse a cheap-model response, or return None to escalate.
+
+        Unparseable responses and confidence below ESCALATION_CONFIDENCE are
+        escalated to the configured model. The running escalation rate is
+        logged so the threshold can be tuned.
+        """
+        profile = None
+        if response is not None:
+            try:
+                profile = self._parse_intent_response(response)
+            except ValueError as e:
+                logger.warning(f"Cheap-tier intent response rejected: {e}")
+            else:
+                if profile.archetype_confidence < ESCALATION_CONFIDENCE:
+                    profile = None
+
+        with _tier_stats_lock:
+            _tier_stats["calls"] += 1
+            if profile is None:
+                _tier_stats["escalations"] += 1
+            calls, escalations = _tier_stats["calls"], _tier_stats["escalations"]
+
+        if profile is None:
+            logger.info(
+                f"Escalating intent analysis to {self.llm_client.model} "
+                f"({escalations}/{calls} escalated so far)"
+            )
+        return profile
+
+    def _complete_profile(
+        self,
+        db: Session,
+        resume_id: str,
+        fingerprint: str,
+        profile: IntentProfile
+    ) -> IntentProfile:
+        """Cache a freshly analyzed profile; returns the profile that was kept."""
+        # Cache result
+        profile = self._cache_profile(db, resume_id, profile)
+        self._profile_cache_store(fingerprint, profile)
+
+        logger.info(
+            f"Intent analysis complete for {resume_id}: "
+            f"{profile.primary_archetype} ({profile.archetype_confidence:.2f})"
+        )
+
+        return profile
+
+    @staticmethod
+    def _resume_fingerprint(resume_data: dict) -> str:
+        """
+        Stable hash of the parts of a resume that drive intent.
+
+        Skills are case-folded and sorted, titles whitespace-normalized, and
+        only the start of the summary is used, so re-uploads of the same
+        resume map to the same key.
+        """
+        skills = sorted({
+            " ".join(str(skill).lower().split())
+            for skill in resume_data.get("skills") or []
+        })
+        titles = [
+            " ".join(str(exp.get("title") or "").lower().split())
+            for exp in resume_data.get("experience") or []
+        ]
+        summary = " ".join((resume_data.get("summary") or "").lower().split())
+
+        canonical = json.dumps(
+            [skills, titles, summary[:FINGERPRINT_SUMMARY_CHARS]],
+            separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _title_gate_profile(self, resume_data: dict) -> Optional[IntentProfile]:
+        """
+        Build a profile from job titles alone when they clearly agree.
+
+        The most recent GATE_TITLE_COUNT titles vote for every archetype whose
+        keywords they contain as whole words. The gate passes only when the
+        leading archetype has GATE_MIN_VOTES votes, including the latest
+        title's, and no other archetype ties it. Orientation scores come from
+        ARCHETYPE_DEFAULT_ORIENTATION; anything less clear-cut goes to the LLM.
+        """
+        titles = [
+            str(exp.get("title") or "").lower()
+            for exp in (resume_data.get("experience") or [])[:GATE_TITLE_COUNT]
+        ]
+
+        votes: Dict[str, int] = {}
+        latest = set()
+        for position, title in enumerate(titles):
+            for archetype, pattern in _ARCHETYPE_TITLE_RES.items():
+                if pattern.search(title):
+                    votes[archetype] = votes.get(archetype, 0) + 1
+                    if position == 0:
+                        latest.add(archetype)
+
+        ranked = sorted(votes, key=votes.get, reverse=True)
+        if not ranked:
+            return None
+
+        leader = ranked[0]
+        if votes[leader] < GATE_MIN_VOTES or leader not in latest:
+            return None
+        if len(ranked) > 1 and votes[ranked[1]] == votes[leader]:
+            return None
+
+        return IntentProfile(
+            primary_archetype=leader,
+            archetype_confidence=GATE_CONFIDENCE * votes[leader] / len(titles),
+            secondary_archetypes=ranked[1:3],
+            work_orientation=dict(ARCHETYPE_DEFAULT_ORIENTATION[leader]),
+            soft_deprioritize=[],
+            reasoning=(
+                f"{votes[leader]} of the {len(titles)} most recent job titles match "
+                f"{leader.replace('_', ' ')}; inferred from titles without LLM analysis."
+            )
+        )
+
+    def _profile_cache_lookup(self, fingerprint: str) -> Optional[IntentProfile]:
+        """Return the profile cached under this exact fingerprint, if any (no near-duplicate matching)."""
+        cached = IntentAnalyzer._profile_cache.get(fingerprint)
+        if cached is None:
+            return None
+        return IntentProfile.from_dict(cached)
+
+    def _profile_cache_store(self, fingerprint: str, profile: IntentProfile) -> None:
+        """Remember a profile for its resume fingerprint, evicting the oldest entries."""
+        cache = IntentAnalyzer._profile_cache
+        cache.pop(fingerprint, None)
+        cache[fingerprint] = profile.to_dict()
+        while len(cache) > PROFILE_CACHE_SIZE:
+            del cache[next(iter(cache))]
+
+    def _build_intent_prompt(self, resume_data: dict) -> Tuple[str, str]:
+        """
+        Build LLM prompt for intent extraction.
+
+        Returns:
+            (static prefix, resume block); the prefix is the same for every resume
+        """
 
         # Extract resume components
         skills = resume_data.get("skills", [])
@@ -150,127 +538,67 @@ class IntentAnalyzer:
         summary = resume_data.get("summary", "")
 
         # Format experience entries
-        experience_text = ""
+        experience_lines = []
         for i, exp in enumerate(experience[:5], 1):
-            experience_text += f"\n{i}. {exp.get('title', 'N/A')} at {exp.get('company', 'N/A')}"
-            experience_text += f"\n   Duration: {exp.get('duration', 'N/A')}"
+            experience_lines.append(
+                f"{i}. {exp.get('title', 'N/A')} at {exp.get('company', 'N/A')} "
+                f"({exp.get('duration', 'N/A')})"
+            )
             description = exp.get('description', '')
             if description:
                 # Truncate long descriptions
                 desc_preview = description[:300] + "..." if len(description) > 300 else description
-                experience_text += f"\n   {desc_preview}"
+                experience_lines.append(f"   {desc_preview}")
 
         # Format skills
         skills_text = ", ".join(skills[:50]) if skills else "Not specified"
 
         # Format education
-        education_text = ""
-        for edu in education:
-            education_text += f"\n- {edu.get('degree', 'N/A')} from {edu.get('institution', 'N/A')}"
-
-        prompt = f"""You are a career intent analyzer. Your job is to understand what kind of role this resume is TARGETING, not just what skills it contains.
-
-RESUME DATA:
-
-Summary:
-{summary if summary else "Not provided"}
+        education_lines = [
+            f"- {edu.get('degree', 'N/A')} from {edu.get('institution', 'N/A')}"
+            for edu in education
+        ]
 
-Skills:
-{skills_text}
+        experience_text = "\n".join(experience_lines) if experience_lines else "Not specified"
+        education_text = "\n".join(education_lines) if education_lines else "Not specified"
 
+        resume_block = f"""RESUME:
+Summary: {summary if summary else "Not provided"}
+Skills: {skills_text}
 Experience:
 {experience_text}
-
 Education:
-{education_text if education_text else "Not specified"}
-
-ANALYSIS TASK:
-
-Analyze this resume and determine:
-
-1. **Primary Role Archetype**: What is the ONE dominant role type this person is targeting?
-   Choose from: {', '.join(self.ROLE_ARCHETYPES)}
-
-2. **Archetype Confidence**: How confident are you? (0.0 to 1.0)
-   - 0.9-1.0: Very clear signal
-   - 0.7-0.9: Strong signal
-   - 0.5-0.7: Moderate signal
-   - Below 0.5: Unclear/ambiguous
-
-3. **Secondary Archetypes**: What are 1-3 adjacent roles? (Ranked by fit)
-
-4. **Work Orientation**: Score these dimensions (0.0 to 1.0):
-   - customer_facing: How much does the work involve direct customer/client interaction?
-   - cross_system: Does the work involve integrating multiple systems vs single-domain focus?
-   - integration_heavy: Is this about connecting things vs building greenfield?
-   - product_adjacent: Does the work touch product decisions vs pure infrastructure?
-   - hands_on_technical: Does the role involve writing code vs managing/strategizing?
-   - external_communication: Does the role require communicating technical concepts to non-technical stakeholders?
-
-5. **Soft Deprioritize**: Which role types should be de-weighted? (Not excluded, just ranked lower)
-   Examples: strategy_only, analytics_only, management_only, sales_oriented, non_technical
-
-6. **Reasoning**: Brief explanation (2-3 sentences) of why you chose this primary archetype
-
-IMPORTANT GUIDELINES:
-- Look at job titles, responsibilities, and progression - not just skills
-- A Solutions Engineer with customer-facing experience is NOT a Platform Engineer
-- Someone who "integrated" systems is different from someone who "built" them
-- Pay attention to verbs: "implemented", "architected", "collaborated with customers", "drove adoption"
-- Industry doesn't matter - focus on work patterns
-- Senior ICs are not managers unless titles/duties clearly indicate people management
-- Don't be swayed by buzzwords - focus on actual work done
-
-Return ONLY valid JSON:
-{{
-  "primary_archetype": "<archetype>",
-  "archetype_confidence": <float>,
-  "secondary_archetypes": ["<archetype1>", "<archetype2>"],
-  "work_orientation": {{
-    "customer_facing": <float>,
-    "cross_system": <float>,
-    "integration_heavy": <float>,
-    "product_adjacent": <float>,
-    "hands_on_technical": <float>,
-    "external_communication": <float>
-  }},
-  "soft_deprioritize": ["<category1>", "<category2>"],
-  "reasoning": "<brief explanation>"
-}}
+{education_text}
 """
-        return prompt
+        return INTENT_PROMPT_PREFIX, resume_block
 
     def _parse_intent_response(self, response: str) -> IntentProfile:
         """Parse LLM response into IntentProfile"""
 
-        # Remove markdown code blocks if present
-        cleaned = response.strip()
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.startswith("```"):
-            cleaned = cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        cleaned = cleaned.strip()
+        # Take the outermost {...} span, which also drops markdown fences and
+        # any prose around the object; fall back to fence stripping
+        match = _JSON_OBJECT_RE.search(response)
+        if match:
+            cleaned = match.group(0)
+        else:
+            cleaned = response.strip()
+            if cleaned.startswith("```json"):
+                cleaned = cleaned[7:]
+            if cleaned.startswith("```"):
+                cleaned = cleaned[3:]
+            if cleaned.endswith("```"):
+                cleaned = cleaned[:-3]
+            cleaned = cleaned.strip()
 
         # Parse JSON
         try:
-            data = json.loads(cleaned)
-        except json.JSONDecodeError as e:
+            data = orjson.loads(cleaned)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse intent response: {e}\nResponse: {response}")
             raise ValueError(f"Invalid JSON response from LLM: {e}")
 
         # Validate required fields
-        required_fields = [
-            "primary_archetype",
-            "archetype_confidence",
-            "secondary_archetypes",
-            "work_orientation",
-            "soft_deprioritize",
-            "reasoning"
-        ]
-
-        for field in required_fields:
+        for field in self.REQUIRED_FIELDS:
             if field not in data:
                 raise ValueError(f"Missing required field: {field}")
 
@@ -327,17 +655,16 @@ Return ONLY valid JSON:
     ) -> Optional[IntentProfile]:
         """Retrieve cached intent profile from database"""
         try:
-            from ..db.models.resume import Resume
-
-            resume = db.query(Resume).filter(Resume.id == resume_id).first()
-            if not resume:
-                return None
-
-            # Check if intent_profile exists
-            if not hasattr(resume, 'intent_profile') or not resume.intent_profile:
+            # Only the JSON column is read; no ORM row is hydrated
+            intent_profile = (
+                db.query(ResumeData.intent_profile)
+                .filter(ResumeData.resume_id == resume_id)
+                .scalar()
+            )
+            if not intent_profile:
                 return None
 
-            return IntentProfile.from_dict(resume.intent_profile)
+            return IntentProfile.from_dict(intent_profile)
 
         except Exception as e:
             logger.warning(f"Failed to retrieve cached profile: {e}")
@@ -348,23 +675,173 @@ Return ONLY valid JSON:
         db: Session,
         resume_id: str,
         profile: IntentProfile
-    ) -> None:
-        """Cache intent profile in database"""
-        try:
-            from ..db.models.resume import Resume
+    ) -> IntentProfile:
+        """
+        Cache intent profile in database, unless one was stored meanwhile.
+
+        Concurrent analyses of the same resume can both miss the cache; the
+        UPDATE only applies while intent_profile is still empty, and the
+        loser adopts the stored profile so every caller sees the same one.
 
-            resume = db.query(Resume).filter(Resume.id == resume_id).first()
-            if resume:
-                resume.intent_profile = profile.to_dict()
-                db.commit()
+        Returns:
+            The profile now stored for the resume (profile itself if it won)
+        """
+        try:
+            # Single UPDATE ... RETURNING instead of loading the row first
+            row = db.execute(
+                update(ResumeData)
+                .where(
+                    ResumeData.resume_id == resume_id,
+                    or_(
+                        ResumeData.intent_profile.is_(None),
+                        func.jsonb_typeof(ResumeData.intent_profile) == "null"
+                    )
+                )
+                .values(intent_profile=profile.to_dict())
+                .returning(ResumeData.id)
+            ).first()
+            db.commit()
+
+            if row is not None:
                 logger.info(f"Cached intent profile for resume {resume_id}")
-            else:
-                logger.warning(f"Resume {resume_id} not found for caching")
+                return profile
+
+            stored_profile = self._get_cached_profile(db, resume_id)
+            if stored_profile:
+                logger.info(f"Intent profile for resume {resume_id} was cached concurrently; using it")
+                return stored_profile
+
+            logger.warning(f"Resume {resume_id} not found for caching")
 
         except Exception as e:
             logger.error(f"Failed to cache intent profile: {e}")
             db.rollback()
 
+        return profile
+
+
+# Job text signals for each role archetype
+_ARCHETYPE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "solutions_engineer": (
+        "solutions engineer", "solution engineer", "solutions architect",
+        "customer solutions", "technical solutions", "presales"
+    ),
+    "integration_engineer": (
+        "integration engineer", "integration specialist", "api engineer",
+        "middleware", "connector", "interoperability"
+    ),
+    "systems_engineer": (
+        "systems engineer", "system engineer", "infrastructure engineer",
+        "linux", "distributed systems", "reliability"
+    ),
+    "platform_engineer": (
+        "platform engineer", "platform", "infrastructure platform",
+        "internal tools", "developer experience", "devex"
+    ),
+    "product_engineer": (
+        "product engineer", "product-focused", "product development",
+        "user-facing", "feature development"
+    ),
+    "frontend_engineer": (
+        "frontend", "front-end", "front end", "ui engineer",
+        "react", "vue", "angular", "web development"
+    ),
+    "backend_engineer": (
+        "backend", "back-end", "back end", "server-side",
+        "api development", "microservices", "distributed systems"
+    ),
+    "fullstack_engineer": (
+        "fullstack", "full-stack", "full stack",
+        "frontend and backend", "end-to-end"
+    ),
+    "data_engineer": (
+        "data engineer", "data pipeline", "etl", "data infrastructure",
+        "data warehouse", "big data"
+    ),
+    "ml_engineer": (
+        "ml engineer", "machine learning engineer", "mlops",
+        "ai engineer", "deep learning"
+    ),
+    "devops_engineer": (
+        "devops", "site reliability", "sre", "ci/cd",
+        "automation", "infrastructure as code"
+    ),
+    "security_engineer": (
+        "security engineer", "cybersecurity", "infosec",
+        "application security", "penetration testing"
+    ),
+    "mobile_engineer": (
+        "mobile engineer", "ios", "android", "mobile development",
+        "react native", "flutter"
+    ),
+    "embedded_engineer": (
+        "embedded", "firmware", "iot", "hardware",
+        "embedded systems", "microcontrollers"
+    ),
+    "analyst": (
+        "analyst", "business analyst", "data analyst",
+        "analytics", "reporting"
+    ),
+    "strategist": (
+        "strategist", "strategy", "strategic planning",
+        "business strategy", "technical strategy"
+    ),
+    "technical_lead": (
+        "tech lead", "technical lead", "lead engineer",
+        "staff engineer", "principal engineer"
+    ),
+    "engineering_manager": (
+        "engineering manager", "manager", "team lead",
+        "people management", "director"
+    ),
+    "product_manager": (
+        "product manager", "pm", "product management",
+        "product owner", "product strategy"
+    ),
+    "technical_writer": (
+        "technical writer", "documentation", "documentation engineer",
+        "developer advocate", "content engineer"
+    )
+}
+
+
+# Job text signals for each work orientation dimension
+ORIENTATION_SIGNALS: Dict[str, Tuple[str, ...]] = {
+    "customer_facing": (
+        "customer", "client", "stakeholder", "external",
+        "customer-facing", "client-facing", "solutions"
+    ),
+    "cross_system": (
+        "integration", "integrate", "cross-functional", "multiple systems",
+        "interoperability", "api", "connector"
+    ),
+    "integration_heavy": (
+        "integrate", "integration", "connector", "middleware",
+        "bridge", "orchestration", "data pipeline"
+    ),
+    "product_adjacent": (
+        "product", "feature", "user experience", "roadmap",
+        "product-facing", "user-centric"
+    ),
+    "hands_on_technical": (
+        "develop", "build", "code", "implement", "engineer",
+        "programming", "software development"
+    ),
+    "external_communication": (
+        "present", "communicate", "collaborate", "evangelize",
+        "technical writing", "documentation"
+    )
+}
+
+# Job text signals for each soft deprioritization category
+DEPRIORITIZATION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "strategy_only": ("strategy", "strategic planning", "business strategy"),
+    "analytics_only": ("analytics", "analyst", "reporting", "business intelligence"),
+    "management_only": ("manager", "director", "vp", "head of", "people management"),
+    "sales_oriented": ("sales", "business development", "account executive", "revenue"),
+    "non_technical": ("non-technical", "administrative", "coordinator")
+}
+
 
 def score_intent_alignment(
     job_title: str,
@@ -382,11 +859,63 @@ def score_intent_alignment(
     Returns:
         Dict with alignment_score (0-100) and component scores
     """
+    return _score_job(_scoring_plan(intent_profile), job_title, job_description)
 
-    # Normalize inputs
-    title_lower = job_title.lower()
-    desc_lower = job_description.lower() if job_description else ""
-    combined_text = f"{title_lower} {desc_lower}"
+
+def score_intent_alignment_batch(
+    jobs: Iterable[Tuple[str, Optional[str]]],
+    intent_profile: IntentProfile
+) -> List[Dict[str, float]]:
+    """
+    Score many jobs against one intent profile.
+
+    Same results as calling score_intent_alignment per job, but the
+    profile-dependent keyword lists and weights are resolved once.
+
+    Args:
+        jobs: (job_title, job_description) pairs
+        intent_profile: Resume intent profile
+
+    Returns:
+        One score dict per job, in input order
+    """
+    plan = _scoring_plan(intent_profile)
+    return [_score_job(plan, title, description) for title, description in jobs]
+
+
+def _scoring_plan(intent_profile: IntentProfile) -> tuple:
+    """Resolve which keyword categories a profile is scored on, and with what weights."""
+    primary = intent_profile.primary_archetype
+    secondaries = [
+        (("archetype", secondary), _get_archetype_keywords(secondary))
+        for secondary in intent_profile.secondary_archetypes[:2]
+    ]
+    orientations = [
+        (("orientation", key), keywords, intent_profile.work_orientation.get(key, 0.5))
+        for key, keywords in ORIENTATION_SIGNALS.items()
+    ]
+    deprioritized = [
+        (("deprioritize", category), DEPRIORITIZATION_KEYWORDS[category])
+        for category in intent_profile.soft_deprioritize
+        if category in DEPRIORITIZATION_KEYWORDS
+    ]
+    return (
+        (("archetype", primary), _get_archetype_keywords(primary)),
+        intent_profile.archetype_confidence,
+        secondaries,
+        orientations,
+        deprioritized,
+    )
+
+
+def _score_job(plan: tuple, job_title: str, job_description: Optional[str]) -> Dict[str, float]:
+    """Score one job against a plan from _scoring_plan."""
+    (primary_category, archetype_keywords), confidence, secondaries, orientations, deprioritized = plan
+
+    combined_text = _normalize_job_text(job_title, job_description)
+
+    # One pass over the text finds every signal keyword it contains
+    hits = _keyword_hits(combined_text)
 
     # Component scores
     archetype_score = 0.0
@@ -394,57 +923,26 @@ def score_intent_alignment(
     deprioritization_penalty = 0.0
 
     # 1. Primary archetype matching (40% weight)
-    archetype_keywords = _get_archetype_keywords(intent_profile.primary_archetype)
-    archetype_matches = sum(1 for kw in archetype_keywords if kw in combined_text)
+    archetype_matches = _count_matches(hits, primary_category, archetype_keywords, combined_text)
 
     if archetype_matches > 0:
         # Scale by confidence
         archetype_score = (
             min(archetype_matches / len(archetype_keywords), 1.0) *
-            intent_profile.archetype_confidence *
+            confidence *
             40
         )
 
     # 2. Secondary archetype partial credit (10% weight)
-    for secondary in intent_profile.secondary_archetypes[:2]:
-        secondary_keywords = _get_archetype_keywords(secondary)
-        secondary_matches = sum(1 for kw in secondary_keywords if kw in combined_text)
+    for category, secondary_keywords in secondaries:
+        secondary_matches = _count_matches(hits, category, secondary_keywords, combined_text)
         if secondary_matches > 0:
             archetype_score += min(secondary_matches / len(secondary_keywords), 1.0) * 5
 
     # 3. Work orientation alignment (30% weight)
-    orientation_signals = {
-        "customer_facing": [
-            "customer", "client", "stakeholder", "external",
-            "customer-facing", "client-facing", "solutions"
-        ],
-        "cross_system": [
-            "integration", "integrate", "cross-functional", "multiple systems",
-            "interoperability", "api", "connector"
-        ],
-        "integration_heavy": [
-            "integrate", "integration", "connector", "middleware",
-            "bridge", "orchestration", "data pipeline"
-        ],
-        "product_adjacent": [
-            "product", "feature", "user experience", "roadmap",
-            "product-facing", "user-centric"
-        ],
-        "hands_on_technical": [
-            "develop", "build", "code", "implement", "engineer",
-            "programming", "software development"
-        ],
-        "external_communication": [
-            "present", "communicate", "collaborate", "evangelize",
-            "technical writing", "documentation"
-        ]
-    }
-
-    for orientation_key, keywords in orientation_signals.items():
-        user_score = intent_profile.work_orientation.get(orientation_key, 0.5)
-
+    for category, keywords, user_score in orientations:
         # Count keyword matches in job
-        job_matches = sum(1 for kw in keywords if kw in combined_text)
+        job_matches = _count_matches(hits, category, keywords, combined_text)
         job_score = min(job_matches / len(keywords), 1.0)
 
         # Alignment is high when both are high or both are low
@@ -452,20 +950,10 @@ def score_intent_alignment(
         orientation_score += alignment * 5  # 6 orientations * 5 = 30 points max
 
     # 4. Soft deprioritization penalties (up to -20% penalty)
-    deprioritization_keywords = {
-        "strategy_only": ["strategy", "strategic planning", "business strategy"],
-        "analytics_only": ["analytics", "analyst", "reporting", "business intelligence"],
-        "management_only": ["manager", "director", "vp", "head of", "people management"],
-        "sales_oriented": ["sales", "business development", "account executive", "revenue"],
-        "non_technical": ["non-technical", "administrative", "coordinator"]
-    }
-
-    for category in intent_profile.soft_deprioritize:
-        if category in deprioritization_keywords:
-            keywords = deprioritization_keywords[category]
-            matches = sum(1 for kw in keywords if kw in combined_text)
-            if matches > 0:
-                deprioritization_penalty += min(matches * 5, 20)  # Max -20 penalty
+    for category, keywords in deprioritized:
+        matches = _count_matches(hits, category, keywords, combined_text)
+        if matches > 0:
+            deprioritization_penalty += min(matches * 5, 20)  # Max -20 penalty
 
     # 5. Calculate final alignment score (0-100)
     base_score = archetype_score + orientation_score
@@ -476,94 +964,84 @@ def score_intent_alignment(
         "archetype_score": archetype_score,
         "orientation_score": orientation_score,
         "deprioritization_penalty": deprioritization_penalty,
-        "confidence": intent_profile.archetype_confidence
+        "confidence": confidence
     }
 
 
-def _get_archetype_keywords(archetype: str) -> List[str]:
+@lru_cache(maxsize=JOB_TEXT_CACHE_SIZE)
+def _normalize_job_text(job_title: str, job_description: Optional[str]) -> str:
+    """Lowercased title and description, remembered across profiles scoring the same job."""
+    desc_lower = job_description.lower() if job_description else ""
+    return f"{job_title.lower()} {desc_lower}"
+
+
+def _keyword_hits(text: str) -> Optional[Dict[Tuple[str, str], int]]:
+    """
+    Count, per signal category, how many of its keywords occur in text.
+
+    Returns None when the automaton is unavailable; callers then scan.
+    """
+    if _SIGNAL_AUTOMATON is None:
+        return None
+
+    seen = set()
+    hits: Dict[Tuple[str, str], int] = {}
+    for _, (keyword_id, categories) in _SIGNAL_AUTOMATON.iter(text):
+        if keyword_id in seen:
+            continue
+        seen.add(keyword_id)
+        for category in categories:
+            hits[category] = hits.get(category, 0) + 1
+    return hits
+
+
+def _count_matches(
+    hits: Optional[Dict[Tuple[str, str], int]],
+    category: Tuple[str, str],
+    keywords: Tuple[str, ...],
+    text: str
+) -> int:
+    """Number of keywords found in text, from the automaton pass when it covers category."""
+    if hits is not None and category in _SIGNAL_CATEGORIES:
+        return hits.get(category, 0)
+    return sum(1 for kw in keywords if kw in text)
+
+
+def _get_archetype_keywords(archetype: str) -> Tuple[str, ...]:
     """Get keywords associated with a role archetype"""
+    return _ARCHETYPE_KEYWORDS.get(archetype, (archetype.replace("_", " "),))
 
-    keyword_map = {
-        "solutions_engineer": [
-            "solutions engineer", "solution engineer", "solutions architect",
-            "customer solutions", "technical solutions", "presales"
-        ],
-        "integration_engineer": [
-            "integration engineer", "integration specialist", "api engineer",
-            "middleware", "connector", "interoperability"
-        ],
-        "systems_engineer": [
-            "systems engineer", "system engineer", "infrastructure engineer",
-            "linux", "distributed systems", "reliability"
-        ],
-        "platform_engineer": [
-            "platform engineer", "platform", "infrastructure platform",
-            "internal tools", "developer experience", "devex"
-        ],
-        "product_engineer": [
-            "product engineer", "product-focused", "product development",
-            "user-facing", "feature development"
-        ],
-        "frontend_engineer": [
-            "frontend", "front-end", "front end", "ui engineer",
-            "react", "vue", "angular", "web development"
-        ],
-        "backend_engineer": [
-            "backend", "back-end", "back end", "server-side",
-            "api development", "microservices", "distributed systems"
-        ],
-        "fullstack_engineer": [
-            "fullstack", "full-stack", "full stack",
-            "frontend and backend", "end-to-end"
-        ],
-        "data_engineer": [
-            "data engineer", "data pipeline", "etl", "data infrastructure",
-            "data warehouse", "big data"
-        ],
-        "ml_engineer": [
-            "ml engineer", "machine learning engineer", "mlops",
-            "ai engineer", "deep learning"
-        ],
-        "devops_engineer": [
-            "devops", "site reliability", "sre", "ci/cd",
-            "automation", "infrastructure as code"
-        ],
-        "security_engineer": [
-            "security engineer", "cybersecurity", "infosec",
-            "application security", "penetration testing"
-        ],
-        "mobile_engineer": [
-            "mobile engineer", "ios", "android", "mobile development",
-            "react native", "flutter"
-        ],
-        "embedded_engineer": [
-            "embedded", "firmware", "iot", "hardware",
-            "embedded systems", "microcontrollers"
-        ],
-        "analyst": [
-            "analyst", "business analyst", "data analyst",
-            "analytics", "reporting"
-        ],
-        "strategist": [
-            "strategist", "strategy", "strategic planning",
-            "business strategy", "technical strategy"
-        ],
-        "technical_lead": [
-            "tech lead", "technical lead", "lead engineer",
-            "staff engineer", "principal engineer"
-        ],
-        "engineering_manager": [
-            "engineering manager", "manager", "team lead",
-            "people management", "director"
-        ],
-        "product_manager": [
-            "product manager", "pm", "product management",
-            "product owner", "product strategy"
-        ],
-        "technical_writer": [
-            "technical writer", "documentation", "documentation engineer",
-            "developer advocate", "content engineer"
-        ]
-    }
 
-    return keyword_map.get(archetype, [archetype.replace("_", " ")])
+# Whole-word archetype keyword patterns, for matching short job titles
+_ARCHETYPE_TITLE_RES = {
+    archetype: re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b")
+    for archetype, keywords in _ARCHETYPE_KEYWORDS.items()
+}
+
+
+def _build_signal_automaton():
+    """
+    Build one Aho-Corasick automaton over every scoring keyword.
+
+    Each keyword maps to (keyword_id, categories listing it), so a keyword
+    shared by several archetypes or orientations is matched once per text.
+    """
+    owners: Dict[str, list] = {}
+    for category, keywords in _SIGNAL_KEYWORDS.items():
+        for keyword in keywords:
+            owners.setdefault(keyword, []).append(category)
+
+    automaton = ahocorasick.Automaton()
+    for keyword_id, (keyword, categories) in enumerate(owners.items()):
+        automaton.add_word(keyword, (keyword_id, tuple(categories)))
+    automaton.make_automaton()
+    return automaton
+
+
+_SIGNAL_KEYWORDS: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    **{("archetype", a): _get_archetype_keywords(a) for a in ROLE_ARCHETYPES},
+    **{("orientation", k): v for k, v in ORIENTATION_SIGNALS.items()},
+    **{("deprioritize", k): v for k, v in DEPRIORITIZATION_KEYWORDS.items()},
+}
+_SIGNAL_CATEGORIES = frozenset(_SIGNAL_KEYWORDS)
+_SIGNAL_AUTOMATON = _build_signal_automaton() if ahocorasick is not None else None
@@ -14,11 +14,16 @@ Usage:
     OR
     Scheduled via cron/Celery/etc.
 """
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import orjson
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import delete, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
 from app.db.models.job_posting import JobPosting
 from app.services.scraping.greenhouse_api import fetch_all_greenhouse_jobs
 from app.services.seed_data import generate_seed_jobs
@@ -26,6 +31,15 @@ import uuid
 
 logger = logging.getLogger(__name__)
 
+# Rows sent per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 500
+
+# Expired jobs removed per DELETE in clean_expired_jobs
+CLEANUP_BATCH_SIZE = 1000
+
+# Greenhouse boards fetched concurrently
+GREENHOUSE_FETCH_WORKERS = 16
+
 
 def normalize_greenhouse_job(job_data: Dict[str, Any], company_slug: str) -> Dict[str, Any]:
     """
@@ -47,9 +61,98 @@ def normalize_greenhouse_job(job_data: Dict[str, Any], company_slug: str) -> Dic
         "external_url": job_data.get("absolute_url", ""),
         "external_id": f"greenhouse_{company_slug}_{job_data.get('id')}",
         "extraction_complete": True,  # Greenhouse jobs come complete
+        "source_payload_hash": payload_hash(job_data),
     }
 
 
+def payload_hash(data: Dict[str, Any]) -> str:
+    """
+    32-character digest of a raw source payload.
+
+    Keys are sorted so the digest only changes when the content does.
+    """
+    return hashlib.blake2b(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+        digest_size=16
+    ).hexdigest()
+
+
+def upsert_job_postings(db: Session, rows: Iterable[Dict[str, Any]]) -> Tuple[int, int, int]:
+    """
+    Insert or update normalized jobs, deduplicated on (source, external_id).
+
+    Rows are consumed UPSERT_BATCH_SIZE at a time, each batch written by one
+    INSERT ... ON CONFLICT DO UPDATE against the unique source/external_id
+    index, so a generator is never materialized in full. Rows carrying a
+    source_payload_hash equal to the stored one are left untouched. Does
+    not commit.
+
+    Args:
+        db: Database session
+        rows: Normalized job dicts, all with the same keys
+
+    Returns:
+        (inserted, updated, skipped) counts
+    """
+    inserted = updated = skipped = 0
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, UPSERT_BATCH_SIZE))
+        if not batch:
+            break
+        batch_inserted, batch_updated, batch_skipped = _upsert_batch(db, batch)
+        inserted += batch_inserted
+        updated += batch_updated
+        skipped += batch_skipped
+
+    return inserted, updated, skipped
+
+
+def _upsert_batch(db: Session, batch: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+    """Write one batch of normalized jobs; returns (inserted, updated, skipped)."""
+    # A key may appear only once per statement; later rows win, as they
+    # would have when each job was written in turn
+    batch = list({(row["source"], row["external_id"]): row for row in batch}.values())
+
+    stmt = insert(JobPosting).values(batch)
+    unchanged_filter = {}
+    if "source_payload_hash" in batch[0]:
+        # Conflicting rows with the same payload are neither updated nor returned
+        unchanged_filter["where"] = JobPosting.source_payload_hash.is_distinct_from(
+            stmt.excluded.source_payload_hash
+        )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobPosting.source, JobPosting.external_id],
+        set_={
+            **{key: stmt.excluded[key] for key in batch[0]},
+            "updated_at": func.now(),
+        },
+        **unchanged_filter
+    ).returning(literal_column("xmax = 0"))  # true for freshly inserted rows
+
+    inserted = updated = 0
+    for (was_inserted,) in db.execute(stmt):
+        if was_inserted:
+            inserted += 1
+        else:
+            updated += 1
+    return inserted, updated, len(batch) - inserted - updated
+
+
+def _normalized_greenhouse_rows(
+    jobs: List[Dict[str, Any]],
+    company_slug: str,
+    stats: Dict[str, int]
+) -> Iterator[Dict[str, Any]]:
+    """Normalize a board's jobs lazily, counting the ones that fail into stats."""
+    for job_data in jobs:
+        try:
+            yield normalize_greenhouse_job(job_data, company_slug)
+        except Exception as e:
+            logger.error(f"Error normalizing job from {company_slug}: {str(e)}")
+            stats["errors"] += 1
+
+
 def ingest_greenhouse_jobs(db: Session, company_slugs: List[str]) -> Dict[str, int]:
     """
     Ingest jobs from Greenhouse company boards.
@@ -67,48 +170,38 @@ def ingest_greenhouse_jobs(db: Session, company_slugs: List[str]) -> Dict[str, i
 
     logger.info(f"Starting Greenhouse ingestion for {len(company_slugs)} companies")
 
-    for company_slug in company_slugs:
-        try:
-            # Fetch jobs from Greenhouse (this is OK here - it's ingestion time)
-            jobs = fetch_all_greenhouse_jobs(company_slug)
-
-            for job_data in jobs:
-                try:
-                    normalized = normalize_greenhouse_job(job_data, company_slug)
-
-                    # Check if job already exists (deduplication)
-                    existing = db.query(JobPosting).filter(
-                        and_(
-                            JobPosting.external_id == normalized["external_id"],
-                            JobPosting.source == "greenhouse"
-                        )
-                    ).first()
-
-                    if existing:
-                        # Update existing job
-                        for key, value in normalized.items():
-                            setattr(existing, key, value)
-                        existing.updated_at = datetime.utcnow()
-                        stats["updated"] += 1
-                    else:
-                        # Insert new job
-                        job_posting = JobPosting(**normalized)
-                        db.add(job_posting)
-                        stats["inserted"] += 1
-
-                except Exception as e:
-                    logger.error(f"Error normalizing job from {company_slug}: {str(e)}")
-                    stats["errors"] += 1
-                    continue
-
-            # Commit after each company to avoid losing progress
-            db.commit()
-            logger.info(f"Ingested {len(jobs)} jobs from {company_slug}")
+    if not company_slugs:
+        return stats
 
-        except Exception as e:
-            logger.error(f"Error fetching jobs from {company_slug}: {str(e)}")
-            stats["errors"] += 1
-            continue
+    # Boards are fetched in parallel (network bound); the session is only
+    # touched from this thread, one company at a time as fetches complete
+    with ThreadPoolExecutor(max_workers=min(GREENHOUSE_FETCH_WORKERS, len(company_slugs))) as executor:
+        futures = {
+            executor.submit(fetch_all_greenhouse_jobs, company_slug): company_slug
+            for company_slug in company_slugs
+        }
+
+        for future in as_completed(futures):
+            company_slug = futures[future]
+            try:
+                jobs = future.result()
+
+                inserted, updated, skipped = upsert_job_postings(
+                    db, _normalized_greenhouse_rows(jobs, company_slug, stats)
+                )
+                stats["inserted"] += inserted
+                stats["updated"] += updated
+                stats["skipped"] += skipped
+
+                # Commit after each company to avoid losing progress
+                db.commit()
+                logger.info(f"Ingested {len(jobs)} jobs from {company_slug}")
+
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error fetching jobs from {company_slug}: {str(e)}")
+                stats["errors"] += 1
+                continue
 
     logger.info(f"Greenhouse ingestion complete: {stats}")
     return stats
@@ -131,33 +224,15 @@ def ingest_seed_jobs(db: Session) -> Dict[str, int]:
     logger.info("Starting seed data ingestion")
 
     seed_jobs = generate_seed_jobs()
+    rows = [{**job, "source_payload_hash": payload_hash(job)} for job in seed_jobs]
 
-    for job_data in seed_jobs:
-        try:
-            # Check if job already exists (deduplication)
-            existing = db.query(JobPosting).filter(
-                and_(
-                    JobPosting.external_id == job_data["external_id"],
-                    JobPosting.source == "seed"
-                )
-            ).first()
-
-            if existing:
-                # Update existing job
-                for key, value in job_data.items():
-                    setattr(existing, key, value)
-                existing.updated_at = datetime.utcnow()
-                stats["updated"] += 1
-            else:
-                # Insert new job
-                job_posting = JobPosting(**job_data)
-                db.add(job_posting)
-                stats["inserted"] += 1
-
-        except Exception as e:
-            logger.error(f"Error inserting seed job: {str(e)}")
-            stats["errors"] += 1
-            continue
+    try:
+        stats["inserted"], stats["updated"], stats["skipped"] = upsert_job_postings(db, rows)
+    except Exception as e:
+        logger.error(f"Error inserting seed jobs: {str(e)}")
+        db.rollback()
+        stats["errors"] += 1
+        return stats
 
     # Commit all seed jobs at once
     db.commit()
@@ -216,11 +291,28 @@ def clean_expired_jobs(db: Session, days_old: int = 30) -> int:
     """
     cutoff_date = datetime.utcnow() - timedelta(days=days_old)
 
-    deleted = db.query(JobPosting).filter(
-        JobPosting.created_at < cutoff_date
-    ).delete()
+    # Delete in bounded chunks, committing each, so locks and WAL stay small
+    # and concurrent ingestion is never blocked behind one huge DELETE
+    deleted = 0
+    while True:
+        expired_ids = (
+            select(JobPosting.id)
+            .where(JobPosting.created_at < cutoff_date)
+            .limit(CLEANUP_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            delete(JobPosting)
+            .where(JobPosting.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        if not result.rowcount:
+            break
+        deleted += result.rowcount
+        logger.info(f"Deleted {deleted} expired jobs so far")
 
-    db.commit()
     logger.info(f"Cleaned {deleted} expired jobs (older than {days_old} days)")
 
     return deleted
@@ -1,34 +1,214 @@
+import asyncio
+import hashlib
 import logging
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from PyPDF2 import PdfReader
-from docx import Document
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import orjson
 from sqlalchemy.orm import Session
 from app.db.models.resume import Resume, ResumeData
 
 logger = logging.getLogger(__name__)
 
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+    logger.warning("PyMuPDF not installed, PDF text extraction will use PyPDF2")
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+    logger.warning("pyahocorasick not installed, skill extraction will fall back to regex")
+
+# Max number of parsed resume files kept in the in-process parse cache
+PARSE_CACHE_SIZE = 128
+
+# content digest -> orjson-encoded parsed fields, oldest first
+_parse_cache: Dict[str, bytes] = {}
+_parse_cache_lock = threading.Lock()
+
+# Comprehensive technical skills dictionary (must match jobs.py for consistency)
+# Organized by category for maintainability
+COMMON_SKILLS = frozenset({
+    # Programming Languages
+    "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust", "Ruby",
+    "PHP", "Swift", "Kotlin", "Scala", "R", "MATLAB", "Perl", "Shell", "Bash",
+
+    # Web Frameworks & Libraries
+    "React", "Angular", "Vue", "Svelte", "Next.js", "Nuxt", "Django", "Flask",
+    "FastAPI", "Express", "Node.js", "Spring", "Spring Boot", "Rails", "Laravel",
+    "ASP.NET", "jQuery", "Bootstrap", "Tailwind", "Material-UI", "Redux", "GraphQL",
+
+    # Databases & Storage
+    "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Cassandra",
+    "DynamoDB", "Oracle", "SQL Server", "MariaDB", "Neo4j", "CouchDB", "InfluxDB",
+    "Snowflake", "BigQuery", "Redshift",
+
+    # Cloud & Infrastructure
+    "AWS", "Azure", "GCP", "Google Cloud", "Heroku", "DigitalOcean", "Vercel",
+    "Netlify", "Cloudflare", "Lambda", "EC2", "S3", "CloudFormation", "ARM",
+
+    # DevOps & Tools
+    "Docker", "Kubernetes", "K8s", "Terraform", "Ansible", "Jenkins", "CircleCI",
+    "GitHub Actions", "GitLab CI", "Travis CI", "Prometheus", "Grafana", "Datadog",
+    "New Relic", "Splunk", "ELK", "Kafka", "RabbitMQ", "Nginx", "Apache",
+
+    # Data & ML
+    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Keras", "Scikit-learn",
+    "Pandas", "NumPy", "Jupyter", "Spark", "Hadoop", "Airflow", "dbt", "Tableau",
+    "Power BI", "Looker", "ML", "AI", "NLP", "Computer Vision", "LLM",
+
+    # Mobile
+    "iOS", "Android", "React Native", "Flutter", "SwiftUI", "UIKit", "Jetpack Compose",
+
+    # Testing & Quality
+    "Jest", "Pytest", "JUnit", "Selenium", "Cypress", "TestNG", "Mocha", "Chai",
+    "TDD", "CI/CD", "QA",
+
+    # Methodologies & Concepts
+    "Agile", "Scrum", "Kanban", "Microservices", "REST", "API", "gRPC", "WebSockets",
+    "OAuth", "SAML", "JWT", "Git", "GitHub", "GitLab", "Bitbucket", "JIRA",
+    "Confluence", "Slack", "Linux", "Unix", "Windows", "macOS",
+
+    # Security
+    "Security", "Cybersecurity", "Penetration Testing", "OWASP", "Encryption", "SSL",
+    "TLS", "VPN", "Firewall", "IAM",
+
+    # Emerging Tech
+    "Blockchain", "Ethereum", "Solidity", "Web3", "NFT", "Cryptocurrency", "Bitcoin",
+    "AR", "VR", "IoT", "Edge Computing", "Serverless",
+
+    # Soft Skills (Technical Adjacent)
+    "Leadership", "Mentoring", "Architecture", "System Design", "Problem Solving",
+    "Communication", "Collaboration", "Code Review",
+
+    # Additional common skills
+    "HTML", "CSS", "SASS", "SCSS"
+})
+
+SKILL_LOWER_TO_CANONICAL = {skill.lower(): skill for skill in COMMON_SKILLS}
+
+
+def _is_word_boundary(text: str, pos: int) -> bool:
+    """Whether `\\b` matches at pos in text."""
+    before = pos > 0 and (text[pos - 1].isalnum() or text[pos - 1] == "_")
+    after = pos < len(text) and (text[pos].isalnum() or text[pos] == "_")
+    return before != after
+
+
+# Longest alternatives first, so the regex reports the longest skill at a
+# position; the shorter skills it starts with are looked up in _NESTED_SKILLS.
+_SKILLS_BY_LENGTH = sorted(SKILL_LOWER_TO_CANONICAL, key=len, reverse=True)
+SKILLS_RE = re.compile(
+    r'\b(?=(' + '|'.join(re.escape(skill) for skill in _SKILLS_BY_LENGTH) + r')\b)'
+)
+
+# skill -> canonical skills that also match wherever it matches, e.g.
+# "react native" -> ("React",)
+_NESTED_SKILLS = {
+    longer: tuple(
+        SKILL_LOWER_TO_CANONICAL[shorter]
+        for shorter in SKILL_LOWER_TO_CANONICAL
+        if len(shorter) < len(longer)
+        and longer.startswith(shorter)
+        and _is_word_boundary(longer, len(shorter))
+    )
+    for longer in SKILL_LOWER_TO_CANONICAL
+}
+
+
+def _build_skills_automaton():
+    """Build an Aho-Corasick automaton mapping each lowercased skill to its canonical name."""
+    automaton = ahocorasick.Automaton()
+    for skill_lower, skill in SKILL_LOWER_TO_CANONICAL.items():
+        automaton.add_word(skill_lower, (len(skill_lower), skill))
+    automaton.make_automaton()
+    return automaton
+
+
+SKILLS_AUTOMATON = _build_skills_automaton() if ahocorasick is not None else None
+
+EMAIL_RE = re.compile(r'[A-Za-z][A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}')
+
+# Tried in order; the first pattern with a match wins
+PHONE_RES = (
+    re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),  # 123-456-7890 or 1234567890
+    re.compile(r'\(\d{3}\)\s*\d{3}[-.]?\d{4}'),     # (123) 456-7890
+    re.compile(r'\+\d{1,3}\s*\d{3}[-.]?\d{3}[-.]?\d{4}'),  # +1 123-456-7890
+)
+
+LINKEDIN_RE = re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+', re.IGNORECASE)
+
+# Section headers must be on their own line (not an inline mention)
+EXPERIENCE_HEADER_RE = re.compile(
+    r'\n\s*((professional\s+)?experience|work\s+history|employment\s+history)\s*\n',
+    re.IGNORECASE
+)
+EXPERIENCE_END_RE = re.compile(r'\n\s*(education|skills|projects|certifications|awards)\s*\n', re.IGNORECASE)
+EDUCATION_HEADER_RE = re.compile(r'education|academic\s+background|academic\s+qualifications', re.IGNORECASE)
+# Same header without IGNORECASE, for scanning already-lowercased text
+EDUCATION_HEADER_LOWER_RE = re.compile(r'education|academic\s+background|academic\s+qualifications')
+EDUCATION_END_RE = re.compile(r'\n\s*(experience|skills|projects|certifications|awards)\s*\n', re.IGNORECASE)
+
+# Multiple blank lines separate job entries
+JOB_BLOCK_SPLIT_RE = re.compile(r'\n\s*\n\s*\n')
+# A blank line separates education entries
+BLANK_LINE_SPLIT_RE = re.compile(r'\n\s*\n')
+# e.g. "2020-2023", "Jan 2020 - Feb 2022"
+DATE_RE = re.compile(r'\b(19|20)\d{2}\b|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)')
+TRAILING_STATE_RE = re.compile(r',?\s*[A-Z]{2}\s*$')
+TRAILING_CITY_RE = re.compile(r',?\s*[^,]+,\s*$')
+
+
 
 def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from a PDF file."""
+    """
+    Extract text from a PDF file.
+
+    Uses PyMuPDF, which is roughly an order of magnitude faster than PyPDF2;
+    PyPDF2 remains the fallback for files PyMuPDF cannot open.
+    """
+    if pymupdf is not None:
+        try:
+            return _extract_text_with_pymupdf(file_path)
+        except Exception as e:
+            logger.warning(f"PyMuPDF failed to read PDF, falling back to PyPDF2: {str(e)}")
+
+    # Imported lazily: only needed when PyMuPDF is unavailable or fails
+    from PyPDF2 import PdfReader
+
     try:
         reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        return "\n".join(page.extract_text() for page in reader.pages).strip()
     except Exception as e:
         logger.error(f"Failed to extract text from PDF: {str(e)}", exc_info=True)
         raise
 
 
+def _extract_text_with_pymupdf(file_path: str) -> str:
+    """Extract text from a PDF file with PyMuPDF."""
+    doc = pymupdf.open(file_path)
+    try:
+        return "\n".join(page.get_text() for page in doc).strip()
+    finally:
+        doc.close()
+
+
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text from a DOCX file."""
+    # Imported lazily: python-docx is slow to import and only DOCX uploads need it
+    from docx import Document
+
     try:
         doc = Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text.strip()
+        # Empty paragraphs are kept: the blank lines they produce are what
+        # the section extractors use to separate entries
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
     except Exception as e:
         logger.error(f"Failed to extract text from DOCX: {str(e)}", exc_info=True)
         raise
@@ -61,24 +241,17 @@ def extract_text_from_resume(file_path: str, mime_type: str) -> str:
 
 def extract_email(text: str) -> Optional[str]:
     """Extract email address from text."""
-    # Pattern that allows for email to follow phone number without space
-    # but requires letter at start of username part
-    email_pattern = r'[A-Za-z][A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}'
-    match = re.search(email_pattern, text)
+    # Pattern allows the email to follow a phone number without a space
+    # but requires a letter at the start of the username part
+    match = EMAIL_RE.search(text)
     return match.group(0) if match else None
 
 
 def extract_phone(text: str) -> Optional[str]:
     """Extract phone number from text."""
     # Match various phone formats
-    phone_patterns = [
-        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # 123-456-7890 or 1234567890
-        r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',     # (123) 456-7890
-        r'\+\d{1,3}\s*\d{3}[-.]?\d{3}[-.]?\d{4}'  # +1 123-456-7890
-    ]
-
-    for pattern in phone_patterns:
-        match = re.search(pattern, text)
+    for pattern in PHONE_RES:
+        match = pattern.search(text)
         if match:
             return match.group(0)
 
@@ -87,87 +260,42 @@ def extract_phone(text: str) -> Optional[str]:
 
 def extract_linkedin_url(text: str) -> Optional[str]:
     """Extract LinkedIn URL from text."""
-    linkedin_pattern = r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+'
-    match = re.search(linkedin_pattern, text, re.IGNORECASE)
+    match = LINKEDIN_RE.search(text)
     return match.group(0) if match else None
 
 
-def extract_skills(text: str) -> List[str]:
+def extract_skills(text: str, text_lower: Optional[str] = None) -> List[str]:
     """
     Extract skills from resume text.
 
     Uses comprehensive skill dictionary (200+ skills) matching job discovery logic.
     This ensures resume skills and job skills use the same vocabulary.
+    Pass text_lower when the caller has already lowercased the text.
     """
-    # Comprehensive technical skills dictionary (must match jobs.py for consistency)
-    # Organized by category for maintainability
-    common_skills = {
-        # Programming Languages
-        "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust", "Ruby",
-        "PHP", "Swift", "Kotlin", "Scala", "R", "MATLAB", "Perl", "Shell", "Bash",
-
-        # Web Frameworks & Libraries
-        "React", "Angular", "Vue", "Svelte", "Next.js", "Nuxt", "Django", "Flask",
-        "FastAPI", "Express", "Node.js", "Spring", "Spring Boot", "Rails", "Laravel",
-        "ASP.NET", "jQuery", "Bootstrap", "Tailwind", "Material-UI", "Redux", "GraphQL",
-
-        # Databases & Storage
-        "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Cassandra",
-        "DynamoDB", "Oracle", "SQL Server", "MariaDB", "Neo4j", "CouchDB", "InfluxDB",
-        "Snowflake", "BigQuery", "Redshift",
-
-        # Cloud & Infrastructure
-        "AWS", "Azure", "GCP", "Google Cloud", "Heroku", "DigitalOcean", "Vercel",
-        "Netlify", "Cloudflare", "Lambda", "EC2", "S3", "CloudFormation", "ARM",
-
-        # DevOps & Tools
-        "Docker", "Kubernetes", "K8s", "Terraform", "Ansible", "Jenkins", "CircleCI",
-        "GitHub Actions", "GitLab CI", "Travis CI", "Prometheus", "Grafana", "Datadog",
-        "New Relic", "Splunk", "ELK", "Kafka", "RabbitMQ", "Nginx", "Apache",
-
-        # Data & ML
-        "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Keras", "Scikit-learn",
-        "Pandas", "NumPy", "Jupyter", "Spark", "Hadoop", "Airflow", "dbt", "Tableau",
-        "Power BI", "Looker", "ML", "AI", "NLP", "Computer Vision", "LLM",
-
-        # Mobile
-        "iOS", "Android", "React Native", "Flutter", "SwiftUI", "UIKit", "Jetpack Compose",
-
-        # Testing & Quality
-        "Jest", "Pytest", "JUnit", "Selenium", "Cypress", "TestNG", "Mocha", "Chai",
-        "TDD", "CI/CD", "QA",
-
-        # Methodologies & Concepts
-        "Agile", "Scrum", "Kanban", "Microservices", "REST", "API", "gRPC", "WebSockets",
-        "OAuth", "SAML", "JWT", "Git", "GitHub", "GitLab", "Bitbucket", "JIRA",
-        "Confluence", "Slack", "Linux", "Unix", "Windows", "macOS",
-
-        # Security
-        "Security", "Cybersecurity", "Penetration Testing", "OWASP", "Encryption", "SSL",
-        "TLS", "VPN", "Firewall", "IAM",
-
-        # Emerging Tech
-        "Blockchain", "Ethereum", "Solidity", "Web3", "NFT", "Cryptocurrency", "Bitcoin",
-        "AR", "VR", "IoT", "Edge Computing", "Serverless",
-
-        # Soft Skills (Technical Adjacent)
-        "Leadership", "Mentoring", "Architecture", "System Design", "Problem Solving",
-        "Communication", "Collaboration", "Code Review",
-
-        # Additional common skills
-        "HTML", "CSS", "SASS", "SCSS"
-    }
-
-    found_skills = []
-    text_lower = text.lower()
-
-    for skill in common_skills:
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            found_skills.append(skill)
-
-    return found_skills
+    found_skills = set()
+    if text_lower is None:
+        text_lower = text.lower()
+
+    if SKILLS_AUTOMATON is not None:
+        # Single linear pass; every dictionary hit (including overlapping and
+        # nested ones) is reported and kept only if it sits on word boundaries
+        for end, (length, skill) in SKILLS_AUTOMATON.iter(text_lower):
+            if (
+                skill not in found_skills
+                and _is_word_boundary(text_lower, end - length + 1)
+                and _is_word_boundary(text_lower, end + 1)
+            ):
+                found_skills.add(skill)
+        return sorted(found_skills)
+
+    # One zero-width scan reports every position where a skill starts as a
+    # whole word; skills nested at the start of a longer match are added
+    # from the precomputed map, matching a per-skill word-boundary search.
+    for skill_lower in SKILLS_RE.findall(text_lower):
+        found_skills.add(SKILL_LOWER_TO_CANONICAL[skill_lower])
+        found_skills.update(_NESTED_SKILLS[skill_lower])
+
+    return sorted(found_skills)
 
 
 def extract_experience_section(text: str) -> List[Dict[str, str]]:
@@ -180,26 +308,23 @@ def extract_experience_section(text: str) -> List[Dict[str, str]]:
     experiences = []
 
     # Look for experience section with more flexible pattern
-    # Must be on its own line (section header, not inline mention)
-    experience_pattern = r'(?i)\n\s*((professional\s+)?experience|work\s+history|employment\s+history)\s*\n'
-    match = re.search(experience_pattern, text, re.IGNORECASE)
+    match = EXPERIENCE_HEADER_RE.search(text)
 
     if match:
         # Get text starting from experience section
         start_pos = match.end()
         # Find end of experience section (next major section or end of text)
-        end_pattern = r'(?i)\n\s*(education|skills|projects|certifications|awards)\s*\n'
-        end_match = re.search(end_pattern, text[start_pos:])
+        end_match = EXPERIENCE_END_RE.search(text, start_pos)
 
         if end_match:
-            experience_text = text[start_pos:start_pos + end_match.start()]
+            experience_text = text[start_pos:end_match.start()]
         else:
             # Take a reasonable chunk if no clear end
             experience_text = text[start_pos:start_pos + 3000]
 
         # Look for job entries by identifying company/title patterns
         # Split by multiple blank lines (indicates new job entry)
-        job_blocks = re.split(r'\n\s*\n\s*\n', experience_text)
+        job_blocks = JOB_BLOCK_SPLIT_RE.split(experience_text)
 
         for block in job_blocks:
             block = block.strip()
@@ -219,8 +344,7 @@ def extract_experience_section(text: str) -> List[Dict[str, str]]:
             # Look for patterns in first 3 lines
             for i, line in enumerate(lines[:3]):
                 # Check for date pattern (e.g., "2020-2023", "Jan 2020 - Feb 2022")
-                date_pattern = r'\b(19|20)\d{2}\b|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'
-                date_match = re.search(date_pattern, line)
+                date_match = DATE_RE.search(line)
 
                 if date_match:
                     # Line contains dates - might also contain company
@@ -231,8 +355,8 @@ def extract_experience_section(text: str) -> List[Dict[str, str]]:
                     # Extract company (everything before dates)
                     company_part = line[:date_start].strip()
                     # Remove trailing comma and location if present
-                    company_part = re.sub(r',?\s*[A-Z]{2}\s*$', '', company_part)  # Remove state code
-                    company_part = re.sub(r',?\s*[^,]+,\s*$', '', company_part)  # Remove "City,"
+                    company_part = TRAILING_STATE_RE.sub('', company_part)  # Remove state code
+                    company_part = TRAILING_CITY_RE.sub('', company_part)  # Remove "City,"
 
                     if company_part and not company:
                         company = company_part
@@ -283,7 +407,7 @@ def extract_experience_section(text: str) -> List[Dict[str, str]]:
     return experiences
 
 
-def extract_education_section(text: str) -> List[Dict[str, str]]:
+def extract_education_section(text: str, text_lower: Optional[str] = None) -> List[Dict[str, str]]:
     """
     Extract education section from resume.
 
@@ -292,46 +416,32 @@ def extract_education_section(text: str) -> List[Dict[str, str]]:
     """
     education = []
 
-    # Look for education section
-    education_pattern = r'(?i)education|academic\s+background|academic\s+qualifications'
-    match = re.search(education_pattern, text, re.IGNORECASE)
+    # Look for education section. The header can appear anywhere, so a
+    # case-sensitive scan of the lowercased text is much cheaper than
+    # IGNORECASE; it is only used when lowercasing kept every offset intact.
+    if text_lower is None:
+        text_lower = text.lower()
+    if len(text_lower) == len(text):
+        match = EDUCATION_HEADER_LOWER_RE.search(text_lower)
+    else:
+        match = EDUCATION_HEADER_RE.search(text)
 
     if match:
         # Get text starting from education section
         start_pos = match.end()
         # Find end of education section (next major section or end of text)
-        end_pattern = r'(?i)\n\s*(experience|skills|projects|certifications|awards)\s*\n'
-        end_match = re.search(end_pattern, text[start_pos:])
+        end_match = EDUCATION_END_RE.search(text, start_pos)
 
         if end_match:
-            education_text = text[start_pos:start_pos + end_match.start()]
+            education_text = text[start_pos:end_match.start()]
         else:
             # Take a reasonable chunk if no clear end
             education_text = text[start_pos:start_pos + 1000]
 
-        # Split into individual education entries
-        lines = education_text.split('\n')
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_entry:
-                    entry_text = ' '.join(current_entry)
-                    if len(entry_text) > 5:  # Minimum meaningful length
-                        education.append({
-                            "degree": entry_text.split(',')[0] if ',' in entry_text else entry_text[:60],
-                            "institution": "",
-                            "year": ""
-                        })
-                    current_entry = []
-            else:
-                current_entry.append(line)
-
-        # Add last entry
-        if current_entry:
-            entry_text = ' '.join(current_entry)
-            if len(entry_text) > 5:
+        # Split into individual education entries on blank lines
+        for block in BLANK_LINE_SPLIT_RE.split(education_text):
+            entry_text = ' '.join(line.strip() for line in block.split('\n') if line.strip())
+            if len(entry_text) > 5:  # Minimum meaningful length
                 education.append({
                     "degree": entry_text.split(',')[0] if ',' in entry_text else entry_text[:60],
                     "institution": "",
@@ -352,17 +462,98 @@ def parse_resume_fields(text: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing parsed resume fields
     """
+    # Lowercase once and share it with the extractors that need it
+    text_lower = text.lower()
+
     return {
         "email": extract_email(text),
         "phone": extract_phone(text),
         "linkedin_url": extract_linkedin_url(text),
-        "skills": extract_skills(text),
+        "skills": extract_skills(text, text_lower),
         "experience": extract_experience_section(text),
-        "education": extract_education_section(text),
+        "education": extract_education_section(text, text_lower),
         "raw_text_other": text
     }
 
 
+def parse_resume_file(file_path: str, mime_type: str) -> Dict[str, Any]:
+    """
+    Extract and parse a resume file, reusing the result for identical files.
+
+    Re-parses and retried jobs usually see the same upload again, so results
+    are cached by a digest of the file bytes and skip both text extraction
+    and field parsing on a hit.
+
+    Raises:
+        ValueError: If no text could be extracted
+    """
+    with open(file_path, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16)
+    digest.update(mime_type.encode())
+    key = digest.hexdigest()
+
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+    if cached is not None:
+        # Decode a fresh copy so callers never share mutable lists
+        return orjson.loads(cached)
+
+    text = extract_text_from_resume(file_path, mime_type)
+
+    if not text or len(text.strip()) == 0:
+        raise ValueError("No text extracted from resume")
+
+    parsed_fields = parse_resume_fields(text)
+
+    with _parse_cache_lock:
+        _parse_cache.pop(key, None)
+        _parse_cache[key] = orjson.dumps(parsed_fields)
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            del _parse_cache[next(iter(_parse_cache))]
+
+    return parsed_fields
+
+
+def _store_parsed_fields(
+    db: Session,
+    resume: Resume,
+    parsed_fields: Dict[str, Any],
+    existing_data: Optional[ResumeData]
+) -> ResumeData:
+    """Write parsed fields onto the resume's ResumeData row, creating it if needed."""
+    if existing_data:
+        # Update existing record
+        existing_data.email = parsed_fields.get("email")
+        existing_data.phone = parsed_fields.get("phone")
+        existing_data.linkedin_url = parsed_fields.get("linkedin_url")
+        existing_data.skills = parsed_fields.get("skills", [])
+        existing_data.experience = parsed_fields.get("experience", [])
+        existing_data.education = parsed_fields.get("education", [])
+        existing_data.raw_text_other = parsed_fields.get("raw_text_other")
+        existing_data.extraction_complete = True
+        # Re-derived from the new fields on the next intent analysis
+        existing_data.intent_profile = None
+
+        return existing_data
+
+    # Create new resume_data record
+    resume_data = ResumeData(
+        resume_id=resume.id,
+        email=parsed_fields.get("email"),
+        phone=parsed_fields.get("phone"),
+        linkedin_url=parsed_fields.get("linkedin_url"),
+        skills=parsed_fields.get("skills", []),
+        experience=parsed_fields.get("experience", []),
+        education=parsed_fields.get("education", []),
+        certifications=[],
+        raw_text_other=parsed_fields.get("raw_text_other"),
+        extraction_complete=True
+    )
+
+    db.add(resume_data)
+    return resume_data
+
+
 def parse_resume_sync(resume_id: str, db: Session) -> ResumeData:
     """
     Synchronously parse a resume file and persist results.
@@ -385,9 +576,10 @@ def parse_resume_sync(resume_id: str, db: Session) -> ResumeData:
         raise ValueError(f"Resume not found: {resume_id}")
 
     try:
-        # Update resume status to processing
+        # Update resume status to processing. Parsing runs inline within this
+        # transaction, so the status is committed together with the outcome
+        # below rather than in a round-trip of its own.
         resume.status = "processing"
-        db.commit()
 
         #logger.info(
             #"Starting synchronous resume parsing",
@@ -397,55 +589,24 @@ def parse_resume_sync(resume_id: str, db: Session) -> ResumeData:
             #}
         #)
 
-        # Extract text from resume file
-        text = extract_text_from_resume(resume.file_path, resume.mime_type)
-
-        if not text or len(text.strip()) == 0:
-            raise ValueError("No text extracted from resume")
-
-        # Parse resume fields
-        parsed_fields = parse_resume_fields(text)
+        # Extract text from resume file and parse resume fields
+        parsed_fields = parse_resume_file(resume.file_path, resume.mime_type)
 
         # Check if resume_data already exists
         existing_data = db.query(ResumeData).filter(
             ResumeData.resume_id == resume.id
         ).first()
 
-        if existing_data:
-            # Update existing record
-            existing_data.email = parsed_fields.get("email")
-            existing_data.phone = parsed_fields.get("phone")
-            existing_data.linkedin_url = parsed_fields.get("linkedin_url")
-            existing_data.skills = parsed_fields.get("skills", [])
-            existing_data.experience = parsed_fields.get("experience", [])
-            existing_data.education = parsed_fields.get("education", [])
-            existing_data.raw_text_other = parsed_fields.get("raw_text_other")
-            existing_data.extraction_complete = True
-
-            resume_data = existing_data
-        else:
-            # Create new resume_data record
-            resume_data = ResumeData(
-                resume_id=resume.id,
-                email=parsed_fields.get("email"),
-                phone=parsed_fields.get("phone"),
-                linkedin_url=parsed_fields.get("linkedin_url"),
-                skills=parsed_fields.get("skills", []),
-                experience=parsed_fields.get("experience", []),
-                education=parsed_fields.get("education", []),
-                certifications=[],
-                raw_text_other=parsed_fields.get("raw_text_other"),
-                extraction_complete=True
-            )
-
-            db.add(resume_data)
+        resume_data = _store_parsed_fields(db, resume, parsed_fields, existing_data)
 
         # Update resume status to parsed
         resume.status = "parsed"
         resume.error_message = None
 
+        # No refresh: commit expires the row, so server-set columns such as
+        # created_at/updated_at load on first access, and only if a caller
+        # actually reads them
         db.commit()
-        db.refresh(resume_data)
 
         logger.info(
             "Resume parsing completed successfully",
@@ -478,3 +639,110 @@ def parse_resume_sync(resume_id: str, db: Session) -> ResumeData:
         db.commit()
 
         raise
+
+
+async def parse_resume_async(resume_id: str, db: Session) -> ResumeData:
+    """
+    Async version of parse_resume_sync.
+
+    Text extraction, parsing and the database writes run in a worker thread
+    so async routes do not block the event loop; the session must not be
+    used elsewhere until this returns.
+    """
+    return await asyncio.to_thread(parse_resume_sync, resume_id, db)
+
+
+def _extract_and_parse(file_path: str, mime_type: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Extract and parse one resume file without touching the database.
+
+    Runs inside a worker process, so failures are returned as an error
+    message instead of raised.
+    """
+    try:
+        text = extract_text_from_resume(file_path, mime_type)
+
+        if not text or len(text.strip()) == 0:
+            return None, "No text extracted from resume"
+
+        return parse_resume_fields(text), None
+
+    except Exception as e:
+        return None, str(e)
+
+
+def parse_resumes_batch(
+    resume_ids: Sequence[str],
+    db: Session,
+    max_workers: Optional[int] = None
+) -> Dict[str, ResumeData]:
+    """
+    Parse many resumes at once and persist the results in a single commit.
+
+    Text extraction and field parsing are CPU-bound, so they are spread over
+    a process pool; each worker only receives a file path and returns the
+    parsed fields. All database reads and writes stay in this process on the
+    caller's session.
+
+    Args:
+        resume_ids: IDs of the resumes to parse
+        db: Database session
+        max_workers: Worker processes to use (defaults to the CPU count)
+
+    Returns:
+        Mapping of resume ID to ResumeData for every resume parsed successfully.
+        Failed resumes are marked failed with their error message.
+    """
+    resumes = db.query(Resume).filter(Resume.id.in_(resume_ids)).all()
+
+    if len(resumes) < len(set(map(str, resume_ids))):
+        found = {str(resume.id) for resume in resumes}
+        logger.warning(
+            "Skipping resumes that were not found",
+            extra={"resume_ids": [str(rid) for rid in resume_ids if str(rid) not in found]}
+        )
+
+    if not resumes:
+        return {}
+
+    jobs = [(resume.file_path, resume.mime_type) for resume in resumes]
+    workers = min(max_workers or os.cpu_count() or 1, len(resumes))
+
+    if workers == 1:
+        results = [_extract_and_parse(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_extract_and_parse, *zip(*jobs), chunksize=4))
+
+    existing_by_resume = {
+        data.resume_id: data
+        for data in db.query(ResumeData).filter(
+            ResumeData.resume_id.in_([resume.id for resume in resumes])
+        )
+    }
+
+    parsed = {}
+    for resume, (parsed_fields, error) in zip(resumes, results):
+        if error is not None:
+            logger.error(
+                "Resume parsing failed",
+                extra={"resume_id": str(resume.id), "error": error}
+            )
+            resume.status = "failed"
+            resume.error_message = error
+            continue
+
+        parsed[str(resume.id)] = _store_parsed_fields(
+            db, resume, parsed_fields, existing_by_resume.get(resume.id)
+        )
+        resume.status = "parsed"
+        resume.error_message = None
+
+    db.commit()
+
+    logger.info(
+        "Batch resume parsing completed",
+        extra={"parsed": len(parsed), "failed": len(resumes) - len(parsed)}
+    )
+
+    return parsed
@@ -1,11 +1,73 @@
 import logging
 import re
 from typing import Optional, Dict, Any
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+    logger.warning("selectolax not installed, job extraction will parse HTML with BeautifulSoup")
+
+# Parsed page: a LexborHTMLParser tree, or a BeautifulSoup when selectolax
+# is unavailable or cannot parse the page. The _extract_* helpers only touch
+# it through the accessors below, so they work with either.
+HtmlTree = Any
+
+# Generic fallback selectors per field, tried in order after any
+# source-specific selector
+_TITLE_FALLBACK_SELECTORS = (
+    'h1.job-title', 'h1[itemprop="title"]', '.job-title',
+    'h1', '[class*="job-title"]', '[class*="position-title"]'
+)
+# Removed from a <title> used as the job title
+_TITLE_SUFFIXES = (' - Careers', ' | Jobs', ' - Job Board')
+_COMPANY_FALLBACK_SELECTORS = (
+    '[itemprop="hiringOrganization"]', '.company-name',
+    '[class*="company"]', 'meta[property="og:site_name"]'
+)
+_LOCATION_FALLBACK_SELECTORS = (
+    '[itemprop="jobLocation"]', '.location',
+    '[class*="location"]', 'meta[property="og:location"]'
+)
+_EMPLOYMENT_TYPE_SELECTORS = (
+    '[itemprop="employmentType"]',
+    '.employment-type',
+    '[class*="employment"]'
+)
+_SALARY_SELECTORS = (
+    '[itemprop="baseSalary"]',
+    '.salary',
+    '[class*="salary"]',
+    '[class*="compensation"]'
+)
+_SALARY_NUM_RE = re.compile(r'\d{2,}')
+_GREENHOUSE_DESCRIPTION_SELECTORS = (
+    '[data-testid="job-description"]',
+    '.gh-job-description',
+    '.gh-content',
+    'section'
+)
+_DESCRIPTION_FALLBACK_SELECTORS = (
+    '[itemprop="description"]',
+    '.job-description',
+    '[class*="description"]',
+    '.content'
+)
+_REQUIREMENTS_SELECTORS = (
+    '.requirements',
+    '[class*="requirements"]',
+    '[class*="qualifications"]'
+)
+_POSTED_DATE_SELECTORS = (
+    '[itemprop="datePosted"]',
+    '.posted-date',
+    '[class*="posted"]'
+)
+
 
 class ExtractedData:
     def __init__(
@@ -33,6 +95,62 @@ class ExtractedData:
         self.needs_review = needs_review
 
 
+
+def _parse_html(html: str) -> HtmlTree:
+    """
+    Parse HTML with selectolax (Lexbor, in C), falling back to BeautifulSoup.
+
+    Script and style elements are removed with either parser, so they never
+    reach description_html/requirements_html and do not count towards text
+    length checks (BeautifulSoup's get_text already skipped their contents).
+    """
+    if LexborHTMLParser is not None:
+        try:
+            tree = LexborHTMLParser(html)
+            tree.strip_tags(["script", "style"])
+            return tree
+        except Exception as e:
+            logger.warning(f"selectolax failed to parse page, falling back to BeautifulSoup: {e}")
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for elem in soup(["script", "style"]):
+        elem.decompose()
+    return soup
+
+
+def _select_one(tree: HtmlTree, selector: str):
+    """First element matching a CSS selector, or None."""
+    if isinstance(tree, BeautifulSoup):
+        return tree.select_one(selector)
+    return tree.css_first(selector)
+
+
+def _text(elem) -> str:
+    """Element text with each text node stripped, like get_text(strip=True)."""
+    if isinstance(elem, Tag):
+        return elem.get_text(strip=True)
+    return elem.text(strip=True)
+
+
+def _attr(elem, name: str) -> str:
+    """Attribute value, or an empty string when absent."""
+    if isinstance(elem, Tag):
+        return elem.get(name, '')
+    return elem.attributes.get(name) or ''
+
+
+def _tag_name(elem) -> str:
+    if isinstance(elem, Tag):
+        return elem.name
+    return elem.tag
+
+
+def _outer_html(elem) -> str:
+    if isinstance(elem, Tag):
+        return str(elem)
+    return elem.html
+
+
 def extract_job_data(html: str, url: str) -> ExtractedData:
     """
     Extract structured job posting data from HTML.
@@ -44,20 +162,20 @@ def extract_job_data(html: str, url: str) -> ExtractedData:
     Returns:
         ExtractedData with parsed fields
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    tree = _parse_html(html)
     
     # Detect ATS source
-    source = _detect_ats(url, soup)
+    source = _detect_ats(url, tree)
     
     # Extract fields
-    title = _extract_title(soup, source)
-    company = _extract_company(soup, source)
-    location = _extract_location(soup, source)
-    employment_type = _extract_employment_type(soup)
-    salary = _extract_salary(soup)
-    description_html = _extract_description(soup, source)
-    requirements_html = _extract_requirements(soup)
-    posted_date = _extract_posted_date(soup)
+    title = _extract_title(tree, source)
+    company = _extract_company(tree, source)
+    location = _extract_location(tree, source)
+    employment_type = _extract_employment_type(tree)
+    salary = _extract_salary(tree)
+    description_html = _extract_description(tree, source)
+    requirements_html = _extract_requirements(tree)
+    posted_date = _extract_posted_date(tree)
     
     # Determine if needs review based on completeness and quality
     needs_review = False
@@ -111,7 +229,7 @@ def extract_job_data(html: str, url: str) -> ExtractedData:
     )
 
 
-def _detect_ats(url: str, soup: BeautifulSoup) -> str:
+def _detect_ats(url: str, tree: HtmlTree) -> str:
     """Detect ATS platform from URL and HTML markers."""
     url_lower = url.lower()
     
@@ -133,9 +251,9 @@ def _detect_ats(url: str, soup: BeautifulSoup) -> str:
         return 'indeed'
     
     # Check HTML meta tags
-    meta_generator = soup.find('meta', attrs={'name': 'generator'})
+    meta_generator = _select_one(tree, 'meta[name="generator"]')
     if meta_generator:
-        content = meta_generator.get('content', '').lower()
+        content = _attr(meta_generator, 'content').lower()
         if 'greenhouse' in content:
             return 'greenhouse'
         elif 'lever' in content:
@@ -144,43 +262,38 @@ def _detect_ats(url: str, soup: BeautifulSoup) -> str:
     return 'unknown'
 
 
-def _extract_title(soup: BeautifulSoup, source: str) -> Optional[str]:
+def _extract_title(tree: HtmlTree, source: str) -> Optional[str]:
     """Extract job title."""
     # Try source-specific selectors
     if source == 'greenhouse':
-        title_elem = soup.select_one('.app-title')
+        title_elem = _select_one(tree, '.app-title')
         if title_elem:
-            return title_elem.get_text(strip=True)
+            return _text(title_elem)
     
     elif source == 'lever':
-        title_elem = soup.select_one('.posting-headline h2')
+        title_elem = _select_one(tree, '.posting-headline h2')
         if title_elem:
-            return title_elem.get_text(strip=True)
+            return _text(title_elem)
     
     elif source == 'workday':
-        title_elem = soup.select_one('[data-automation-id="jobPostingHeader"]')
+        title_elem = _select_one(tree, '[data-automation-id="jobPostingHeader"]')
         if title_elem:
-            return title_elem.get_text(strip=True)
+            return _text(title_elem)
     
     # Generic fallback
-    selectors = [
-        'h1.job-title', 'h1[itemprop="title"]', '.job-title',
-        'h1', '[class*="job-title"]', '[class*="position-title"]'
-    ]
-    
-    for selector in selectors:
-        elem = soup.select_one(selector)
+    for selector in _TITLE_FALLBACK_SELECTORS:
+        elem = _select_one(tree, selector)
         if elem:
-            text = elem.get_text(strip=True)
+            text = _text(elem)
             if len(text) > 5 and len(text) < 200:
                 return text
     
     # Try page title as last resort
-    title_tag = soup.find('title')
+    title_tag = _select_one(tree, 'title')
     if title_tag:
-        text = title_tag.get_text(strip=True)
+        text = _text(title_tag)
         # Remove common suffixes
-        for suffix in [' - Careers', ' | Jobs', ' - Job Board']:
+        for suffix in _TITLE_SUFFIXES:
             text = text.replace(suffix, '')
         if len(text) > 5 and len(text) < 200:
             return text
@@ -188,31 +301,26 @@ def _extract_title(soup: BeautifulSoup, source: str) -> Optional[str]:
     return None
 
 
-def _extract_company(soup: BeautifulSoup, source: str) -> Optional[str]:
+def _extract_company(tree: HtmlTree, source: str) -> Optional[str]:
     """Extract company name."""
     if source == 'greenhouse':
-        company_elem = soup.select_one('.company-name')
+        company_elem = _select_one(tree, '.company-name')
         if company_elem:
-            return company_elem.get_text(strip=True)
+            return _text(company_elem)
     
     elif source == 'lever':
-        company_elem = soup.select_one('.main-header-text a')
+        company_elem = _select_one(tree, '.main-header-text a')
         if company_elem:
-            return company_elem.get_text(strip=True)
+            return _text(company_elem)
     
     # Generic fallback
-    selectors = [
-        '[itemprop="hiringOrganization"]', '.company-name',
-        '[class*="company"]', 'meta[property="og:site_name"]'
-    ]
-    
-    for selector in selectors:
-        elem = soup.select_one(selector)
+    for selector in _COMPANY_FALLBACK_SELECTORS:
+        elem = _select_one(tree, selector)
         if elem:
-            if elem.name == 'meta':
-                text = elem.get('content', '')
+            if _tag_name(elem) == 'meta':
+                text = _attr(elem, 'content')
             else:
-                text = elem.get_text(strip=True)
+                text = _text(elem)
             
             if len(text) > 1 and len(text) < 100:
                 return text
@@ -220,31 +328,26 @@ def _extract_company(soup: BeautifulSoup, source: str) -> Optional[str]:
     return None
 
 
-def _extract_location(soup: BeautifulSoup, source: str) -> Optional[str]:
+def _extract_location(tree: HtmlTree, source: str) -> Optional[str]:
     """Extract job location."""
     if source == 'greenhouse':
-        location_elem = soup.select_one('.location')
+        location_elem = _select_one(tree, '.location')
         if location_elem:
-            return location_elem.get_text(strip=True)
+            return _text(location_elem)
     
     elif source == 'lever':
-        location_elem = soup.select_one('.posting-categories .location')
+        location_elem = _select_one(tree, '.posting-categories .location')
         if location_elem:
-            return location_elem.get_text(strip=True)
+            return _text(location_elem)
     
     # Generic fallback
-    selectors = [
-        '[itemprop="jobLocation"]', '.location',
-        '[class*="location"]', 'meta[property="og:location"]'
-    ]
-    
-    for selector in selectors:
-        elem = soup.select_one(selector)
+    for selector in _LOCATION_FALLBACK_SELECTORS:
+        elem = _select_one(tree, selector)
         if elem:
-            if elem.name == 'meta':
-                text = elem.get('content', '')
+            if _tag_name(elem) == 'meta':
+                text = _attr(elem, 'content')
             else:
-                text = elem.get_text(strip=True)
+                text = _text(elem)
             
             if len(text) > 2 and len(text) < 200:
                 return text
@@ -252,18 +355,12 @@ def _extract_location(soup: BeautifulSoup, source: str) -> Optional[str]:
     return None
 
 
-def _extract_employment_type(soup: BeautifulSoup) -> Optional[str]:
+def _extract_employment_type(tree: HtmlTree) -> Optional[str]:
     """Extract employment type (Full-time, Part-time, etc)."""
-    selectors = [
-        '[itemprop="employmentType"]',
-        '.employment-type',
-        '[class*="employment"]'
-    ]
-    
-    for selector in selectors:
-        elem = soup.select_one(selector)
+    for selector in _EMPLOYMENT_TYPE_SELECTORS:
+        elem = _select_one(tree, selector)
         if elem:
-            text = elem.get_text(strip=True).lower()
+            text = _text(elem).lower()
             
             if 'full' in text or 'full-time' in text:
                 return 'Full-time'
@@ -277,99 +374,67 @@ def _extract_employment_type(soup: BeautifulSoup) -> Optional[str]:
     return None
 
 
-def _extract_salary(soup: BeautifulSoup) -> Optional[str]:
+def _extract_salary(tree: HtmlTree) -> Optional[str]:
     """Extract salary information."""
-    selectors = [
-        '[itemprop="baseSalary"]',
-        '.salary',
-        '[class*="salary"]',
-        '[class*="compensation"]'
-    ]
-    
-    for selector in selectors:
-        elem = soup.select_one(selector)
+    for selector in _SALARY_SELECTORS:
+        elem = _select_one(tree, selector)
         if elem:
-            text = elem.get_text(strip=True)
+            text = _text(elem)
             # Check if looks like salary (contains numbers and $)
-            if '$' in text or re.search(r'\d{2,}', text):
+            if '$' in text or _SALARY_NUM_RE.search(text):
                 return text
     
     return None
 
 
-def _extract_description(soup: BeautifulSoup, source: str) -> Optional[str]:
+def _extract_description(tree: HtmlTree, source: str) -> Optional[str]:
     """Extract job description HTML."""
     # Greenhouse embedded (custom sites)
     if source == "greenhouse":
         # FIX: handle custom React-rendered Greenhouse career pages (e.g. getfiber.ai)
-        elem = soup.select_one('main')
-        if elem and len(elem.get_text(strip=True)) > 300:
-            return str(elem)
-
-        selectors = [
-            '[data-testid="job-description"]',
-            '.gh-job-description',
-            '.gh-content',
-            'section'
-        ]
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem and len(elem.get_text(strip=True)) > 200:
-                return str(elem)
+        elem = _select_one(tree, 'main')
+        if elem and len(_text(elem)) > 300:
+            return _outer_html(elem)
+
+        for selector in _GREENHOUSE_DESCRIPTION_SELECTORS:
+            elem = _select_one(tree, selector)
+            if elem and len(_text(elem)) > 200:
+                return _outer_html(elem)
 
     # Lever
     if source == "lever":
-        desc_elem = soup.select_one('.section-wrapper .section:first-of-type')
+        desc_elem = _select_one(tree, '.section-wrapper .section:first-of-type')
         if desc_elem:
-            return str(desc_elem)
+            return _outer_html(desc_elem)
 
     # Generic fallback
-    selectors = [
-        '[itemprop="description"]',
-        '.job-description',
-        '[class*="description"]',
-        '.content'
-    ]
-
-    for selector in selectors:
-        elem = soup.select_one(selector)
-        if elem and len(elem.get_text(strip=True)) > 200:
-            return str(elem)
+    for selector in _DESCRIPTION_FALLBACK_SELECTORS:
+        elem = _select_one(tree, selector)
+        if elem and len(_text(elem)) > 200:
+            return _outer_html(elem)
 
     logger.warning("Job description not found during extraction")
     return None
 
 
-def _extract_requirements(soup: BeautifulSoup) -> Optional[str]:
+def _extract_requirements(tree: HtmlTree) -> Optional[str]:
     """Extract job requirements HTML."""
-    selectors = [
-        '.requirements',
-        '[class*="requirements"]',
-        '[class*="qualifications"]'
-    ]
-    
-    for selector in selectors:
-        elem = soup.select_one(selector)
-        if elem and len(elem.get_text(strip=True)) > 50:
-            return str(elem)
+    for selector in _REQUIREMENTS_SELECTORS:
+        elem = _select_one(tree, selector)
+        if elem and len(_text(elem)) > 50:
+            return _outer_html(elem)
     
     return None
 
 
-def _extract_posted_date(soup: BeautifulSoup) -> Optional[str]:
+def _extract_posted_date(tree: HtmlTree) -> Optional[str]:
     """Extract posting date."""
-    selectors = [
-        '[itemprop="datePosted"]',
-        '.posted-date',
-        '[class*="posted"]'
-    ]
-    
-    for selector in selectors:
-        elem = soup.select_one(selector)
+    for selector in _POSTED_DATE_SELECTORS:
+        elem = _select_one(tree, selector)
         if elem:
-            if elem.name == 'meta':
-                return elem.get('content', '')
+            if _tag_name(elem) == 'meta':
+                return _attr(elem, 'content')
             else:
-                return elem.get_text(strip=True)
+                return _text(elem)
     
     return None
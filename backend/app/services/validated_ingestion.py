@@ -15,7 +15,7 @@ from app.services.serpapi_jobs import (
     get_industry_queries,
     test_serpapi_connection
 )
-from app.services.industry_classifier import classify_industry, validate_industry
+from app.services.industry_classifier import classify_industry_batch, validate_industry
 
 logger = logging.getLogger(__name__)
 
@@ -245,20 +245,23 @@ def ingest_validated_jobs(
                     max_results=max_jobs_per_query
                 )
 
-                # Process each fetched job
+                # Validate each fetched job
+                valid_jobs = []
                 for job_data in jobs:
                     audit.record_job_fetched()
 
                     # Validate job data
-                    if not validate_job_data(job_data, audit):
-                        continue  # Skip invalid jobs
+                    if validate_job_data(job_data, audit):
+                        valid_jobs.append(job_data)
 
-                    # Classify industry
-                    classified_industry = classify_industry(
-                        job_title=job_data["job_title"],
-                        job_description=job_data["description"]
-                    )
+                # Classify industry for the whole query in one call
+                classified_industries = classify_industry_batch(
+                    (job_data["job_title"], job_data["description"])
+                    for job_data in valid_jobs
+                )
 
+                # Process each valid job
+                for job_data, classified_industry in zip(valid_jobs, classified_industries):
                     # Drop jobs we can't classify (data quality requirement)
                     if classified_industry == "unknown":
                         audit.record_drop_no_industry()
@@ -8,7 +8,7 @@ from sqlalchemy import select
 from app.db.session import SessionLocal
 from app.db.models.queue import ParserQueue
 from app.db.models.resume import Resume, ResumeData
-from app.services.resume_parser import extract_text_from_resume, parse_resume_fields
+from app.services.resume_parser import parse_resume_file
 
 logger = logging.getLogger(__name__)
 
@@ -51,14 +51,8 @@ async def process_parser_job(job: ParserQueue):
             }
         )
 
-        # Extract text from resume file
-        text = extract_text_from_resume(job.file_path, resume.mime_type)
-
-        if not text or len(text.strip()) == 0:
-            raise ValueError("No text extracted from resume")
-
-        # Parse resume fields
-        parsed_fields = parse_resume_fields(text)
+        # Extract text from resume file and parse resume fields
+        parsed_fields = parse_resume_file(job.file_path, resume.mime_type)
 
         # Check if resume_data already exists
         existing_data = db.query(ResumeData).filter(
@@ -75,6 +69,8 @@ async def process_parser_job(job: ParserQueue):
             existing_data.education = parsed_fields.get("education", [])
             existing_data.raw_text_other = parsed_fields.get("raw_text_other")
             existing_data.extraction_complete = True
+            # Re-derived from the new fields on the next intent analysis
+            existing_data.intent_profile = None
 
             resume_data = existing_data
         else: